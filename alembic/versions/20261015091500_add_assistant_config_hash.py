@@ -0,0 +1,84 @@
+"""Add assistant config hash column
+
+Revision ID: 3b7e9c1a2f40
+Revises: 8f3a2b1c4d5e
+Create Date: 2026-10-15 09:15:00.000000
+
+The functional index introduced in 8f3a2b1c4d5e evaluates md5(config::text)
+on every insert, update and index probe, re-serializing the JSONB value each
+time and storing a 32-character hex string as the key.
+
+This migration adds a config_hash column written by the application: an
+8-byte BLAKE2b digest of the canonical JSON config (sorted keys) stored as a
+signed bigint. The unique index on (user_id, graph_id, config_hash) replaces
+the functional one. Existing rows are hashed once here.
+"""
+
+import hashlib
+
+import orjson
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b7e9c1a2f40"
+down_revision = "8f3a2b1c4d5e"
+branch_labels = None
+depends_on = None
+
+
+def _config_hash(config: dict | None) -> int:
+    # Must match agent_server.core.orm.assistant_config_hash
+    digest = hashlib.blake2b(
+        orjson.dumps(config or {}, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def upgrade() -> None:
+    """Index assistants on an application-computed bigint hash of config."""
+    op.add_column("assistant", sa.Column("config_hash", sa.BigInteger(), nullable=True))
+
+    assistant = sa.table(
+        "assistant",
+        sa.column("assistant_id", sa.Text),
+        sa.column("config", postgresql.JSONB),
+        sa.column("config_hash", sa.BigInteger),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(assistant.c.assistant_id, assistant.c.config)
+    ).fetchall()
+    if rows:
+        bind.execute(
+            assistant.update()
+            .where(assistant.c.assistant_id == sa.bindparam("_assistant_id"))
+            .values(config_hash=sa.bindparam("_config_hash")),
+            [
+                {"_assistant_id": assistant_id, "_config_hash": _config_hash(config)}
+                for assistant_id, config in rows
+            ],
+        )
+
+    op.execute(sa.text("DROP INDEX IF EXISTS idx_assistant_user_graph_config"))
+    op.create_index(
+        "idx_assistant_user_graph_config",
+        "assistant",
+        ["user_id", "graph_id", "config_hash"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Restore the MD5 functional index and drop the hash column."""
+    op.execute(sa.text("DROP INDEX IF EXISTS idx_assistant_user_graph_config"))
+    op.drop_column("assistant", "config_hash")
+
+    op.execute(
+        sa.text("""
+            CREATE UNIQUE INDEX idx_assistant_user_graph_config
+            ON assistant (user_id, graph_id, md5(config::text))
+        """)
+    )
@@ -11,8 +11,8 @@ __all__ = ["agent"]
 
 def __getattr__(name: str) -> Any:  # pragma: no cover
     if name == "agent":
-        from graphs.dragon_chat_agent.dragon_chat_agent import agent  # local import
+        from graphs.dragon_chat_agent.dragon_chat_agent import get_agent  # local import
 
-        return agent
+        return get_agent()
     raise AttributeError(name)
 
@@ -1,16 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
 from functools import cache
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+# Models built inside a running event loop, per loop. Their shared AsyncClient
+# pools connections that belong to that loop, so neither can be reused by
+# another one.
+_models_by_loop: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, dict[str, ChatOpenAI]]
+] = weakref.WeakKeyDictionary()
+
+
+def _new_http_async_client() -> httpx.AsyncClient:
+    """Connection pool shared by every model get_model() builds in one loop.
+
+    Without it each ChatOpenAI instance opens its own pool, so every model
+    variant pays for its own TCP/TLS handshakes to the same host.
+    """
+    # The SDK's own client class keeps its default timeout and redirect handling
+    from openai import DefaultAsyncHttpxClient
+
+    import httpx
+
+    return DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
+
 
-@cache
 def get_model(model_name: str, /) -> ChatOpenAI:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _get_model_outside_loop(model_name)
+
+    entry = _models_by_loop.get(loop)
+    if entry is None:
+        entry = _models_by_loop[loop] = (_new_http_async_client(), {})
+    http_async_client, models = entry
+    model = models.get(model_name)
+    if model is None:
+        model = models[model_name] = _build_model(model_name, http_async_client)
+    return model
+
+
+@cache
+def _get_model_outside_loop(model_name: str, /) -> ChatOpenAI:
+    return _build_model(model_name, None)
+
+
+def _build_model(
+    model_name: str, http_async_client: httpx.AsyncClient | None
+) -> ChatOpenAI:
+    # Imported here: langchain_openai/openai are slow to import and only needed
+    # once a model is actually requested.
+    from langchain_openai import ChatOpenAI
+
     # No agregar temperatura para modelos gpt-5-mini o gpt5
     if "gpt-5-mini" in model_name.lower() or "gpt5" in model_name.lower():
         return ChatOpenAI(
             model=model_name,
-            stream_options={"include_usage": True}
+            stream_options={"include_usage": True},
+            http_async_client=http_async_client,
         )
     return ChatOpenAI(
         model=model_name,
         temperature=0.5,
-        stream_options={"include_usage": True}
-    )
\ No newline at end of file
+        stream_options={"include_usage": True},
+        http_async_client=http_async_client,
+    )
@@ -1,5 +1,6 @@
 #settings.py
 from enum import StrEnum
+from functools import cache
 from typing import Annotated, Any
 
 from dotenv import find_dotenv
@@ -40,7 +41,6 @@ def check_str_is_http(x: str) -> str:
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_file=find_dotenv(),
         env_file_encoding="utf-8",
         env_ignore_empty=True,
         extra="ignore",
@@ -57,4 +57,13 @@ class Settings(BaseSettings):
         return self.MODE == "dev"
 
 
-settings = Settings()
+@cache
+def _dotenv_path() -> str:
+    """Locate the .env file once; ``find_dotenv`` walks up the directory tree."""
+    return find_dotenv()
+
+
+@cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, loaded on first use."""
+    return Settings(_env_file=_dotenv_path())
@@ -1,37 +1,53 @@
-"""Define the dragon_chat_agent with dynamic tools support."""
-
-import logging
-
-from langchain.agents import create_agent
-from langchain_core.tools import tool
-from graphs.dragon_chat_agent.utils.langfuse import get_callbacks
-from graphs.dragon_chat_agent.context import DragonAgentContext
-from graphs.dragon_chat_agent.middleware.pre_agent_middleware import (
-    PreAgentMiddleware,
-)
-from graphs.dragon_chat_agent.middleware.dynamic_prompt import inject_dynamic_prompt
-from graphs.dragon_chat_agent.middleware.trim_messages import trim_messages
-from graphs.dragon_chat_agent.utils.load_model import load_chat_model
-from graphs.dragon_chat_agent.tools.knowledge_base_tools import (
-    search_knowledge_base
-)
-
-callbacks = get_callbacks()
-
-# Load default model
-default_model = load_chat_model("gpt-5-mini")
-
-
-@tool
-def _placeholder_dynamic_router() -> str:
-    """Internal placeholder to keep the ToolNode alive."""
-    return "dynamic-router"
-
-
-agent = create_agent(
-    model=default_model,
-    tools=[_placeholder_dynamic_router, search_knowledge_base],
-    context_schema=DragonAgentContext,
-    middleware=[inject_dynamic_prompt, PreAgentMiddleware(), trim_messages],
-).with_config({"callbacks": callbacks})
-
+"""Define the dragon_chat_agent with dynamic tools support.
+
+The agent is built on first access of ``agent`` rather than at import time:
+building it pulls in LangChain/OpenAI, instantiates the default model and sets
+up Langfuse callbacks, none of which is needed just to import this module.
+"""
+
+from functools import cache
+from typing import Any
+
+
+@cache
+def get_agent() -> Any:
+    """Build the dragon_chat_agent graph once per process."""
+    from langchain.agents import create_agent
+    from langchain_core.tools import tool
+
+    from graphs.dragon_chat_agent.context import DragonAgentContext
+    from graphs.dragon_chat_agent.middleware.dynamic_prompt import (
+        inject_dynamic_prompt,
+    )
+    from graphs.dragon_chat_agent.middleware.pre_agent_middleware import (
+        PreAgentMiddleware,
+    )
+    from graphs.dragon_chat_agent.tools.knowledge_base_tools import (
+        search_knowledge_base,
+    )
+    from graphs.dragon_chat_agent.utils.langfuse import get_callbacks
+    from graphs.dragon_chat_agent.utils.load_model import load_chat_model
+
+    @tool
+    def _placeholder_dynamic_router() -> str:
+        """Internal placeholder to keep the ToolNode alive."""
+        return "dynamic-router"
+
+    callbacks = get_callbacks()
+
+    # Load default model
+    default_model = load_chat_model("gpt-5-mini")
+
+    return create_agent(
+        model=default_model,
+        tools=[_placeholder_dynamic_router, search_knowledge_base],
+        context_schema=DragonAgentContext,
+        # PreAgentMiddleware also trims the history (see pre_agent_middleware.MAX_MESSAGES)
+        middleware=[inject_dynamic_prompt, PreAgentMiddleware()],
+    ).with_config({"callbacks": callbacks})
+
+
+def __getattr__(name: str) -> Any:
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
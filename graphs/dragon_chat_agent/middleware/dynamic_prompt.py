@@ -1,3 +1,9 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import orjson
 from langchain.agents.middleware import ModelRequest, dynamic_prompt
 
 import structlog
@@ -13,6 +19,111 @@ from graphs.dragon_chat_agent.utils.datetime_utils import get_current_zulu_datet
 
 logger = structlog.get_logger(__name__)
 
+# Matches {datetime_context}, {{datetime_context}}, {current_datetime}, {{current_datetime}}
+_PLACEHOLDER_RE = re.compile(r"\{\{?(datetime_context|current_datetime)\}?\}")
+
+# (current_datetime, datetime_context) of the last rendered section
+_datetime_cache: tuple[str, str] = ("", "")
+
+
+def _current_datetime_context() -> tuple[str, str]:
+    """Return (current_datetime, datetime_context), rebuilt at most once per second.
+
+    The section only has second resolution, so concurrent model calls within the
+    same second can share a single formatted string. It is keyed on the timestamp
+    string itself, so the two values always describe the same second.
+    """
+    global _datetime_cache
+    current_datetime = get_current_zulu_datetime()
+    cached = _datetime_cache
+    if cached[0] != current_datetime:
+        cached = (current_datetime, build_datetime_context_section(current_datetime))
+        _datetime_cache = cached
+    return cached
+
+
+class _PromptTemplate(NamedTuple):
+    """Time-independent parts of a rendered system prompt."""
+
+    # base prompt split on placeholders: literal text at even indexes,
+    # placeholder names at odd indexes
+    chunks: tuple[str, ...]
+    insertion_mode: str
+    user_context: str
+    knowledge_instructions: str
+
+
+def _build_prompt_template(
+    base_prompt: str,
+    metadata: dict[str, Any],
+    has_knowledge_base: bool,
+) -> _PromptTemplate:
+    chunks = tuple(_PLACEHOLDER_RE.split(base_prompt))
+    placeholders = chunks[1::2]
+    if "current_datetime" in placeholders:
+        insertion_mode = "replaced_value"
+    elif "datetime_context" in placeholders:
+        insertion_mode = "replaced_section"
+    else:
+        insertion_mode = "appended"
+
+    return _PromptTemplate(
+        chunks=chunks,
+        insertion_mode=insertion_mode,
+        user_context=build_user_context_section(metadata) if metadata else "",
+        knowledge_instructions=build_knowledge_base_instructions(has_knowledge_base),
+    )
+
+
+# Multi-turn conversations re-render the same prompt/metadata pair on every model
+# call; only the datetime changes between calls.
+_PROMPT_TEMPLATE_CACHE_SIZE = 2048
+_prompt_templates: OrderedDict[tuple[str, bytes, bool], _PromptTemplate] = OrderedDict()
+_prompt_templates_lock = threading.Lock()
+
+
+def _cached_prompt_template(
+    base_prompt: str, metadata: dict[str, Any], has_knowledge_base: bool
+) -> _PromptTemplate:
+    # The metadata is keyed by its JSON encoding: equal-comparing values such as
+    # True, 1 and 1.0 render differently, so they must not share an entry. Key
+    # order is kept too, since the user context lists fields in that order.
+    try:
+        metadata_key = orjson.dumps(metadata)
+    except TypeError:
+        return _build_prompt_template(base_prompt, metadata, has_knowledge_base)
+
+    key = (base_prompt, metadata_key, has_knowledge_base)
+    with _prompt_templates_lock:
+        template = _prompt_templates.get(key)
+        if template is not None:
+            _prompt_templates.move_to_end(key)
+            return template
+
+    template = _build_prompt_template(base_prompt, metadata, has_knowledge_base)
+    with _prompt_templates_lock:
+        _prompt_templates[key] = template
+        if len(_prompt_templates) > _PROMPT_TEMPLATE_CACHE_SIZE:
+            _prompt_templates.popitem(last=False)
+    return template
+
+
+def _render_prompt(
+    template: _PromptTemplate, current_datetime: str, datetime_context: str
+) -> str:
+    values = {
+        "datetime_context": datetime_context,
+        "current_datetime": current_datetime,
+    }
+    parts = list(template.chunks)
+    parts[1::2] = [values[name] for name in parts[1::2]]
+    parts.append(template.user_context)
+    if template.insertion_mode == "appended":
+        parts.append(datetime_context)
+    parts.append(template.knowledge_instructions)
+    # Single join so the final prompt buffer is allocated once
+    return "".join(parts)
+
 
 @dynamic_prompt
 def inject_dynamic_prompt(request: ModelRequest) -> str:
@@ -44,70 +155,38 @@ def inject_dynamic_prompt(request: ModelRequest) -> str:
             prompt_source = "runtime.config.system_prompt"
 
     # Priority 2: fallback to runtime context
+    # Extract system_prompt and metadata in a single pass over the context type
+    metadata: Any = None
     if isinstance(ctx, DragonAgentContext):
-        base_prompt = ctx.system_prompt
+        base_prompt, metadata = ctx.system_prompt, ctx.metadata
         prompt_source = prompt_source or "runtime.context.system_prompt"
     elif isinstance(ctx, dict):
-        base_prompt = ctx.get("system_prompt")
+        base_prompt, metadata = ctx.get("system_prompt"), ctx.get("metadata")
         prompt_source = prompt_source or "runtime.context.system_prompt"
+    if not isinstance(metadata, dict):
+        metadata = {}
 
     # Priority 2: Fallback to default
     if not base_prompt:
         base_prompt = DEFAULT_SYSTEM_PROMPT
         prompt_source = prompt_source or "default"
 
-    # Build user context from metadata
-    user_context = ""
-    if isinstance(ctx, DragonAgentContext):
-        if ctx.metadata:
-            user_context = build_user_context_section(ctx.metadata)
-    elif isinstance(ctx, dict):
-        metadata = ctx.get("metadata", {})
-        if metadata:
-            user_context = build_user_context_section(metadata)
-
     # Add datetime context section (support placeholder replacement if prompt templates expect it)
-    current_datetime = get_current_zulu_datetime()
-    datetime_context = build_datetime_context_section(current_datetime)
+    current_datetime, datetime_context = _current_datetime_context()
 
     # Check if assistant has knowledge base (from metadata)
-    has_knowledge_base = False
-    if isinstance(ctx, DragonAgentContext):
-        if ctx.metadata and isinstance(ctx.metadata, dict):
-            has_knowledge_base = ctx.metadata.get("has_knowledge_base", False)
-    elif isinstance(ctx, dict):
-        metadata = ctx.get("metadata", {})
-        if metadata and isinstance(metadata, dict):
-            has_knowledge_base = metadata.get("has_knowledge_base", False)
-
-    # Add knowledge base instructions only if assistant has KB
-    knowledge_instructions = build_knowledge_base_instructions(has_knowledge_base)
-
-    # Prefer replacing placeholders if present in the base prompt
-    insertion_mode = "appended"
-    if "{datetime_context}" in base_prompt or "{{datetime_context}}" in base_prompt:
-        base_prompt = base_prompt.replace("{datetime_context}", datetime_context).replace(
-            "{{datetime_context}}", datetime_context
-        )
-        insertion_mode = "replaced_section"
+    has_knowledge_base = bool(metadata.get("has_knowledge_base", False))
 
-    if "{current_datetime}" in base_prompt or "{{current_datetime}}" in base_prompt:
-        base_prompt = base_prompt.replace("{current_datetime}", current_datetime).replace(
-            "{{current_datetime}}", current_datetime
-        )
-        insertion_mode = "replaced_value"
-
-    final_prompt = base_prompt + user_context
-    if insertion_mode == "appended":
-        final_prompt += datetime_context
-    final_prompt += knowledge_instructions
+    # Everything except the datetime is cached per (prompt, metadata, KB flag)
+    template = _cached_prompt_template(base_prompt, metadata, has_knowledge_base)
+    final_prompt = _render_prompt(template, current_datetime, datetime_context)
 
     logger.debug(
         "dynamic_prompt.built",
         prompt_source=prompt_source,
-        insertion_mode=insertion_mode,
-        has_user_context=bool(user_context),
-        has_knowledge_instructions=bool(knowledge_instructions),
+        insertion_mode=template.insertion_mode,
+        has_user_context=bool(template.user_context),
+        has_knowledge_instructions=bool(template.knowledge_instructions),
         has_runtime_context=ctx is not None,
         runtime_context_type=type(ctx).__name__ if ctx is not None else None,
     )
@@ -1,6 +1,12 @@
-import structlog
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Set
 from typing import Any, Dict, Iterable, List
 
+import orjson
+import structlog
 from langchain.agents.middleware import AgentMiddleware
 from langchain.agents.middleware.types import ModelRequest, ModelResponse
 from langchain_core.messages import ToolMessage
@@ -11,6 +17,29 @@ from graphs.dragon_chat_agent.utils.message_validator import validate_and_clean_
 from graphs.dragon_chat_agent.tools import build_tool_from_config
 
 logger = structlog.get_logger(__name__)
+# structlog filters by the level of the stdlib logger of the same name; checking it
+# directly lets hot paths skip building log-only values when the event is dropped.
+_stdlib_logger = logging.getLogger(__name__)
+
+# The model only ever sees the most recent MAX_MESSAGES messages of the history
+MAX_MESSAGES = 20
+
+# Built (tool, llm_tool_spec) pairs keyed by a digest of each tool config.
+# Tool configs are usually identical across turns of a conversation, and the
+# built tools are stateless, so they can be shared between requests. Caching
+# per tool means adding or changing one tool only rebuilds that tool.
+_TOOL_CACHE_MAXSIZE = 1024
+_tool_cache: OrderedDict[bytes, tuple[Any, dict[str, Any]]] = OrderedDict()
+_tool_cache_lock = threading.Lock()
+
+
+def _tool_config_fingerprint(cfg: dict[str, Any]) -> bytes | None:
+    """Stable digest of a tool config, or None if it is not JSON-serializable."""
+    try:
+        payload = orjson.dumps(cfg, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        return None
+    return hashlib.blake2b(payload, digest_size=16).digest()
 
 
 class PreAgentMiddleware(AgentMiddleware):
@@ -39,12 +68,13 @@ class PreAgentMiddleware(AgentMiddleware):
                     metadata=context.get("metadata", {}) or {},
                 )
                 request.runtime.context = coerced
-                logger.debug(
-                    "dynamic_tools.context.coerced_from_dict",
-                    tools_count=len(coerced.tools or []),
-                    has_system_prompt=bool(coerced.system_prompt),
-                    metadata_keys=list((coerced.metadata or {}).keys()),
-                )
+                if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "dynamic_tools.context.coerced_from_dict",
+                        tools_count=len(coerced.tools or []),
+                        has_system_prompt=bool(coerced.system_prompt),
+                        metadata_keys=list((coerced.metadata or {}).keys()),
+                    )
                 return coerced
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
@@ -86,56 +116,73 @@ class PreAgentMiddleware(AgentMiddleware):
                 )
         return valid
 
-    @staticmethod
-    def _to_llm_tool_spec(cfg: dict[str, Any], *, tool_name: str | None = None) -> dict[str, Any]:
-        return {
-            "type": "function",
-            "function": {
-                "name": tool_name or cfg["name"],
-                "description": cfg.get("description", ""),
-                "parameters": cfg.get("schema", {"type": "object", "properties": {}}),
-            },
-        }
-
     def _build_runtime_tooling(
         self, context: DragonAgentContext
     ) -> tuple[Dict[str, Any], List[dict[str, Any]]]:
+        tool_cfgs = list(self._extract_tool_configs(context))
+        if not tool_cfgs:
+            return {}, []
+
         dynamic_tools: Dict[str, Any] = {}
         tool_specs: List[dict[str, Any]] = []
 
-        tool_cfgs = list(self._extract_tool_configs(context))
         logger.debug(
             "dynamic_tools.build.start",
             tools_count=len(tool_cfgs),
         )
 
         for cfg in tool_cfgs:
-            try:
-                tool = build_tool_from_config(cfg)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "dynamic_tools.build.failed",
-                    tool_name=cfg.get("name"),
-                    url=cfg.get("url"),
-                    error=str(exc),
-                    error_type=type(exc).__name__,
-                    exc_info=True,
-                )
+            built = self._get_or_build_tool(cfg)
+            if built is None:
                 continue
-
+            tool, spec = built
             dynamic_tools[tool.name] = tool
-            # IMPORTANT: use the *actual* built tool name (may be sanitized for provider compatibility)
-            tool_specs.append(self._to_llm_tool_spec(cfg, tool_name=tool.name))
-            logger.info(
-                "dynamic_tools.build.succeeded",
-                tool_name=tool.name,
-                original_name=getattr(tool, "metadata", {}).get("original_name"),
-            )
+            tool_specs.append(spec)
 
         return dynamic_tools, tool_specs
 
+    def _get_or_build_tool(self, cfg: dict[str, Any]) -> tuple[Any, dict[str, Any]] | None:
+        cache_key = _tool_config_fingerprint(cfg)
+        if cache_key is not None:
+            with _tool_cache_lock:
+                cached = _tool_cache.get(cache_key)
+                if cached is not None:
+                    _tool_cache.move_to_end(cache_key)
+                    return cached
+
+        built = self._build_tool(cfg)
+        if built is not None and cache_key is not None:
+            with _tool_cache_lock:
+                _tool_cache[cache_key] = built
+                if len(_tool_cache) > _TOOL_CACHE_MAXSIZE:
+                    _tool_cache.popitem(last=False)
+        return built
+
+    def _build_tool(self, cfg: dict[str, Any]) -> tuple[Any, dict[str, Any]] | None:
+        try:
+            tool = build_tool_from_config(cfg)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "dynamic_tools.build.failed",
+                tool_name=cfg.get("name"),
+                url=cfg.get("url"),
+                error=str(exc),
+                error_type=type(exc).__name__,
+                exc_info=True,
+            )
+            return None
+
+        # The spec carries the *actual* built tool name (may be sanitized for provider compatibility)
+        spec = tool.metadata["llm_spec"]
+        logger.info(
+            "dynamic_tools.build.succeeded",
+            tool_name=tool.name,
+            original_name=getattr(tool, "metadata", {}).get("original_name"),
+        )
+        return tool, spec
+
     @staticmethod
-    def _should_force_tool(state: dict[str, Any], tool_names: List[str]) -> bool:
+    def _should_force_tool(state: dict[str, Any], tool_names: Set[str]) -> bool:
         if not tool_names:
             return False
         messages = state.get("messages", [])
@@ -148,108 +195,93 @@ class PreAgentMiddleware(AgentMiddleware):
         self,
         request_state: dict[str, Any],
         tool_specs: List[dict[str, Any]],
+        tool_names: Set[str],
         original_choice: Any,
     ) -> Any:
         if not tool_specs:
             return None
-        tool_names = [spec["function"]["name"] for spec in tool_specs]
         if self._should_force_tool(request_state, tool_names):
-            if len(tool_names) == 1:
+            if len(tool_specs) == 1:
                 return {
                     "type": "function",
-                    "function": {"name": tool_names[0]},
+                    "function": {"name": tool_specs[0]["function"]["name"]},
                 }
             return "auto"
         return original_choice or "auto"
 
-    def wrap_model_call(self, request: ModelRequest, handler) -> ModelResponse:
+    def _prepare_model_request(self, request: ModelRequest) -> ModelRequest:
+        """Build dynamic tools from context and return the request to send to the model."""
         context = self._ensure_context(request)
-        dynamic_tools, tool_specs = self._build_runtime_tooling(context)
-        context.dynamic_tools = dynamic_tools
+        if context.tools:
+            dynamic_tools, tool_specs = self._build_runtime_tooling(context)
+            context.dynamic_tools = dynamic_tools
+        else:
+            # Tool-less chat (the common case): nothing to build or bind, only the
+            # message history still needs normalizing below.
+            dynamic_tools, tool_specs = {}, []
+            if context.dynamic_tools:
+                context.dynamic_tools = dynamic_tools
+
+        # Collect every change and apply them with a single request.override()
+        overrides: dict[str, Any] = {}
 
-        # Validate and clean messages to ensure tool_calls have corresponding ToolMessages
+        # Trim to the last MAX_MESSAGES, then validate and clean what is left to ensure
+        # tool_calls have corresponding ToolMessages. Doing both here means the message
+        # list is walked and the request overridden once instead of once per middleware.
         if "messages" in request.state:
-            cleaned_messages = validate_and_clean_messages(request.state["messages"])
-            if cleaned_messages != request.state["messages"]:
-                updated_state = {**request.state, "messages": cleaned_messages}
-                request = request.override(state=updated_state)
+            messages = request.state["messages"]
+            recent = messages
+            if len(messages) > MAX_MESSAGES:
+                logger.info(
+                    "dynamic_tools.messages.trimmed",
+                    messages_count=len(messages),
+                    max_messages=MAX_MESSAGES,
+                )
+                recent = messages[-MAX_MESSAGES:]
+            cleaned_messages = validate_and_clean_messages(recent)
+            if cleaned_messages is not messages:
+                overrides["state"] = {**request.state, "messages": cleaned_messages}
+                overrides["messages"] = cleaned_messages
 
         # Only override tools if there are dynamic tools to add
         # Don't override if tool_specs is empty - keep the existing static tools
-        overrides = {}
         if tool_specs:
             # Combine existing tools with dynamic tools
-            existing_tools = request.tools or []
-            combined_tools = list(existing_tools) + tool_specs
-            overrides["tools"] = combined_tools
+            overrides["tools"] = [*(request.tools or ()), *tool_specs]
             overrides["tool_choice"] = self._resolve_tool_choice(
-                request.state, tool_specs, request.tool_choice
+                overrides.get("state", request.state),
+                tool_specs,
+                # dynamic_tools is keyed by the spec names, so its keys view
+                # already gives O(1) name membership without building a set.
+                dynamic_tools.keys(),
+                request.tool_choice,
             )
 
-        if overrides:
-            updated_request = request.override(**overrides)
-            return handler(updated_request)
-        return handler(request)
+        return request.override(**overrides) if overrides else request
+
+    def wrap_model_call(self, request: ModelRequest, handler) -> ModelResponse:
+        return handler(self._prepare_model_request(request))
 
     async def awrap_model_call(
         self, request: ModelRequest, handler
     ) -> ModelResponse:
         """Build dynamic tools from context and add them to the request."""
-        context = self._ensure_context(request)
-        dynamic_tools, tool_specs = self._build_runtime_tooling(context)
-        context.dynamic_tools = dynamic_tools
-
-        # Validate and clean messages to ensure tool_calls have corresponding ToolMessages
-        if "messages" in request.state:
-            cleaned_messages = validate_and_clean_messages(request.state["messages"])
-            if cleaned_messages != request.state["messages"]:
-                updated_state = {**request.state, "messages": cleaned_messages}
-                request = request.override(state=updated_state)
-
-        # Only override tools if there are dynamic tools to add
-        # Don't override if tool_specs is empty - keep the existing static tools
-        overrides = {}
-        if tool_specs:
-            # Combine existing tools with dynamic tools
-            existing_tools = request.tools or []
-            combined_tools = list(existing_tools) + tool_specs
-            overrides["tools"] = combined_tools
-            overrides["tool_choice"] = self._resolve_tool_choice(
-                request.state, tool_specs, request.tool_choice
-            )
-
-        if overrides:
-            updated_request = request.override(**overrides)
-            return await handler(updated_request)
-        return await handler(request)
-
-    def _lookup_runtime_tool(self, request) -> Any | None:
-        runtime_context = getattr(request.runtime, "context", None)
-        tool_name = request.tool_call["name"]
-
-        if isinstance(runtime_context, DragonAgentContext):
-            return runtime_context.dynamic_tools.get(tool_name)
-
-        if isinstance(runtime_context, dict):
-            dynamic_tools = runtime_context.get("dynamic_tools") or {}
-            if isinstance(dynamic_tools, dict):
-                return dynamic_tools.get(tool_name)
-
-        return None
+        return await handler(self._prepare_model_request(request))
 
-    def _get_available_dynamic_tools(self, request) -> List[str]:
-        """Get list of available dynamic tool names for debugging."""
+    @staticmethod
+    def _get_dynamic_tools(request) -> Dict[str, Any]:
+        """Dynamic tools built for this run, keyed by tool name (not copied)."""
         runtime_context = getattr(request.runtime, "context", None)
 
         if isinstance(runtime_context, DragonAgentContext):
-            return list(runtime_context.dynamic_tools.keys())
+            return runtime_context.dynamic_tools
 
         if isinstance(runtime_context, dict):
             dynamic_tools = runtime_context.get("dynamic_tools") or {}
             if isinstance(dynamic_tools, dict):
-                return list(dynamic_tools.keys())
+                return dynamic_tools
 
-        return []
+        return {}
 
     def _ensure_context_from_request(self, request) -> DragonAgentContext | None:
         """Get or create DragonAgentContext from request runtime."""
@@ -273,117 +305,117 @@ class PreAgentMiddleware(AgentMiddleware):
 
         return None
 
-    def wrap_tool_call(self, request, handler):
+    def _resolve_dynamic_tool(self, request) -> tuple[Any | None, Dict[str, Any]]:
+        """Return the dynamic tool for this call (if any) and the available dynamic tools."""
         tool_name = request.tool_call["name"]
-        tool_call_id = request.tool_call["id"]
-
-        logger.info("dynamic_tools.call.wrap", tool_name=tool_name, tool_call_id=tool_call_id)
 
         # First try to lookup in existing dynamic_tools
-        tool = self._lookup_runtime_tool(request)
-        available_tools = self._get_available_dynamic_tools(request)
+        dynamic_tools = self._get_dynamic_tools(request)
+        tool = dynamic_tools.get(tool_name)
 
         # If not found, try to rebuild dynamic tools from context
         # This handles the case where context.dynamic_tools was lost between model call and tool call
-        if tool is None and not available_tools:
+        if tool is None and not dynamic_tools:
             logger.info("dynamic_tools.call.rebuild_attempt", tool_name=tool_name)
             context = self._ensure_context_from_request(request)
             if context and context.tools:
                 dynamic_tools, _ = self._build_runtime_tooling(context)
                 context.dynamic_tools = dynamic_tools
                 tool = dynamic_tools.get(tool_name)
-                available_tools = list(dynamic_tools.keys())
-                logger.info(
-                    "dynamic_tools.call.rebuild_result",
-                    found=tool is not None,
-                    available=available_tools,
-                )
+                if _stdlib_logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "dynamic_tools.call.rebuild_result",
+                        found=tool is not None,
+                        available=list(dynamic_tools),
+                    )
+
+        # Materializing the tool names is only worth it when the event is emitted
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "dynamic_tools.call.lookup_result",
+                found=tool is not None,
+                available_dynamic_tools=list(dynamic_tools),
+            )
+        return tool, dynamic_tools
 
-        logger.info(
-            "dynamic_tools.call.lookup_result",
-            found=tool is not None,
-            available_dynamic_tools=available_tools,
+    @staticmethod
+    def _tool_not_found_message(
+        request, dynamic_tools: Dict[str, Any], exc: Exception
+    ) -> ToolMessage:
+        # Tool not found in static tools either - return error message
+        tool_name = request.tool_call["name"]
+        logger.error(
+            "dynamic_tools.call.not_found",
+            tool_name=tool_name,
+            available_dynamic_tools=list(dynamic_tools),
+            error=str(exc),
+            error_type=type(exc).__name__,
+            exc_info=True,
+        )
+        return ToolMessage(
+            content=f"Error: Tool '{tool_name}' is not available. The tool may not be configured correctly or the context was lost.",
+            name=tool_name,
+            tool_call_id=request.tool_call["id"],
+            status="error",
         )
 
+    @staticmethod
+    def _tool_failed_message(request, tool: Any, exc: Exception) -> ToolMessage:
+        tool_call_id = request.tool_call["id"]
+        logger.warning(
+            "dynamic_tools.call.failed",
+            tool_name=tool.name,
+            tool_call_id=tool_call_id,
+            error=str(exc),
+            error_type=type(exc).__name__,
+            exc_info=True,
+        )
+        return ToolMessage(
+            content=str(exc),
+            name=request.tool_call["name"],
+            tool_call_id=tool_call_id,
+            status="error",
+        )
+
+    @staticmethod
+    def _tool_result_message(request, result: Any) -> ToolMessage:
+        tool_name = request.tool_call["name"]
+        tool_call_id = request.tool_call["id"]
+        logger.info("dynamic_tools.call.succeeded", tool_name=tool_name, tool_call_id=tool_call_id)
+        return ToolMessage(
+            content=msg_content_output(result),
+            name=tool_name,
+            tool_call_id=tool_call_id,
+        )
+
+    def wrap_tool_call(self, request, handler):
+        tool_name = request.tool_call["name"]
+        tool_call_id = request.tool_call["id"]
+
+        logger.info("dynamic_tools.call.wrap", tool_name=tool_name, tool_call_id=tool_call_id)
+        tool, dynamic_tools = self._resolve_dynamic_tool(request)
+
         if tool is None:
             # Try the default handler for static tools
             logger.info("dynamic_tools.call.fallback_to_static", tool_name=tool_name)
             try:
                 return handler(request)
             except Exception as exc:
-                # Tool not found in static tools either - return error message
-                logger.error(
-                    "dynamic_tools.call.not_found",
-                    tool_name=tool_name,
-                    available_dynamic_tools=available_tools,
-                    error=str(exc),
-                    error_type=type(exc).__name__,
-                    exc_info=True,
-                )
-                return ToolMessage(
-                    content=f"Error: Tool '{tool_name}' is not available. The tool may not be configured correctly or the context was lost.",
-                    name=tool_name,
-                    tool_call_id=tool_call_id,
-                    status="error",
-                )
+                return self._tool_not_found_message(request, dynamic_tools, exc)
 
         logger.info("dynamic_tools.call.execute", tool_name=tool_name, tool_call_id=tool_call_id)
         try:
             result = tool.invoke(request.tool_call["args"])
         except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "dynamic_tools.call.failed",
-                tool_name=tool.name,
-                tool_call_id=tool_call_id,
-                error=str(exc),
-                error_type=type(exc).__name__,
-                exc_info=True,
-            )
-            return ToolMessage(
-                content=str(exc),
-                name=tool_name,
-                tool_call_id=tool_call_id,
-                status="error",
-            )
-
-        logger.info("dynamic_tools.call.succeeded", tool_name=tool_name, tool_call_id=tool_call_id)
-        return ToolMessage(
-            content=msg_content_output(result),
-            name=tool_name,
-            tool_call_id=tool_call_id,
-        )
+            return self._tool_failed_message(request, tool, exc)
+        return self._tool_result_message(request, result)
 
     async def awrap_tool_call(self, request, handler):
         tool_name = request.tool_call["name"]
         tool_call_id = request.tool_call["id"]
 
         logger.info("dynamic_tools.call.awrap", tool_name=tool_name, tool_call_id=tool_call_id)
-
-        # First try to lookup in existing dynamic_tools
-        tool = self._lookup_runtime_tool(request)
-        available_tools = self._get_available_dynamic_tools(request)
-
-        # If not found, try to rebuild dynamic tools from context
-        # This handles the case where context.dynamic_tools was lost between model call and tool call
-        if tool is None and not available_tools:
-            logger.info("dynamic_tools.call.rebuild_attempt", tool_name=tool_name)
-            context = self._ensure_context_from_request(request)
-            if context and context.tools:
-                dynamic_tools, _ = self._build_runtime_tooling(context)
-                context.dynamic_tools = dynamic_tools
-                tool = dynamic_tools.get(tool_name)
-                available_tools = list(dynamic_tools.keys())
-                logger.info(
-                    "dynamic_tools.call.rebuild_result",
-                    found=tool is not None,
-                    available=available_tools,
-                )
-
-        logger.info(
-            "dynamic_tools.call.lookup_result",
-            found=tool is not None,
-            available_dynamic_tools=available_tools,
-        )
+        tool, dynamic_tools = self._resolve_dynamic_tool(request)
 
         if tool is None:
             # Try the default handler for static tools
@@ -391,44 +423,11 @@ class PreAgentMiddleware(AgentMiddleware):
             try:
                 return await handler(request)
             except Exception as exc:
-                # Tool not found in static tools either - return error message
-                logger.error(
-                    "dynamic_tools.call.not_found",
-                    tool_name=tool_name,
-                    available_dynamic_tools=available_tools,
-                    error=str(exc),
-                    error_type=type(exc).__name__,
-                    exc_info=True,
-                )
-                return ToolMessage(
-                    content=f"Error: Tool '{tool_name}' is not available. The tool may not be configured correctly or the context was lost.",
-                    name=tool_name,
-                    tool_call_id=tool_call_id,
-                    status="error",
-                )
+                return self._tool_not_found_message(request, dynamic_tools, exc)
 
         logger.info("dynamic_tools.call.execute", tool_name=tool_name, tool_call_id=tool_call_id)
         try:
             result = await tool.ainvoke(request.tool_call["args"])
         except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "dynamic_tools.call.failed",
-                tool_name=tool.name,
-                tool_call_id=tool_call_id,
-                error=str(exc),
-                error_type=type(exc).__name__,
-                exc_info=True,
-            )
-            return ToolMessage(
-                content=str(exc),
-                name=tool_name,
-                tool_call_id=tool_call_id,
-                status="error",
-            )
-
-        logger.info("dynamic_tools.call.succeeded", tool_name=tool_name, tool_call_id=tool_call_id)
-        return ToolMessage(
-            content=msg_content_output(result),
-            name=tool_name,
-            tool_call_id=tool_call_id,
-        )
+            return self._tool_failed_message(request, tool, exc)
+        return self._tool_result_message(request, result)
@@ -1,9 +1,12 @@
 """Default prompts for the dragon_chat_agent."""
 
-DEFAULT_SYSTEM_PROMPT = """You are a helpful AI assistant that can use tools to help users accomplish their tasks.
+import sys
+
+# Interned: the default prompt is part of the prompt-template cache key in
+# middleware/dynamic_prompt.py, so lookups can short-circuit on identity.
+DEFAULT_SYSTEM_PROMPT = sys.intern("""You are a helpful AI assistant that can use tools to help users accomplish their tasks.
 
 You have access to various tools that can make HTTP requests to different endpoints.
 When a user asks you to do something, use the available tools to gather information or perform actions.
 
-Always be helpful, accurate, and clear in your responses."""
-
+Always be helpful, accurate, and clear in your responses.""")
@@ -1,17 +1,45 @@
+import asyncio
+import hashlib
+import logging
 import re
+import threading
 import time
+import weakref
+from collections import OrderedDict
+from functools import cache, lru_cache
 from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
-import anyio
+import httpx
+import orjson
 import requests
 import structlog
 from langchain_core.tools import StructuredTool
-from pydantic import ConfigDict, Field, create_model
+from pydantic import BaseModel, ConfigDict, Field, create_model
 from requests import RequestException
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import Retry
 
 _OPENAI_TOOL_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_TOOL_NAME_DISALLOWED_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_FIELD_NAME_DISALLOWED_RE = re.compile(r"[^A-Za-z0-9_]+")
+# Default schema for tools without parameters. Shared by every such tool (and its
+# LLM spec), so it must never be mutated; a MappingProxyType is not used because
+# the spec has to stay a plain dict for JSON serialization.
+_EMPTY_OBJECT_SCHEMA: Dict[str, Any] = {"type": "object", "properties": {}}
+# Best-effort JSON Schema type -> Python type mapping (anything else is Any)
+_JSON_TYPE_MAP: Dict[str, Any] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
 logger = structlog.get_logger(__name__)
+# structlog filters by the level of the stdlib logger of the same name
+_stdlib_logger = logging.getLogger(__name__)
 
 
 def _sanitize_tool_name(name: str) -> Tuple[str, bool]:
@@ -19,11 +47,20 @@ def _sanitize_tool_name(name: str) -> Tuple[str, bool]:
 
     OpenAI-style function/tool names must match ^[a-zA-Z0-9_-]{1,64}$.
     """
+    # Fast path: most configured names are already valid and need no rewriting.
+    if (
+        name
+        and _OPENAI_TOOL_NAME_RE.fullmatch(name)
+        and name[0] not in "_-"
+        and name[-1] != "_"
+    ):
+        return name, False
+
     original = (name or "").strip()
     if not original:
         return "tool", True
 
-    sanitized = re.sub(r"[^A-Za-z0-9_-]+", "_", original)
+    sanitized = _TOOL_NAME_DISALLOWED_RE.sub("_", original)
     sanitized = sanitized.strip("_")
     if not sanitized:
         sanitized = "tool"
@@ -45,11 +82,14 @@ def _sanitize_tool_name(name: str) -> Tuple[str, bool]:
 
 def _safe_field_name(name: str, used: set[str]) -> str:
     # Pydantic model field names must be valid identifiers.
-    candidate = re.sub(r"[^A-Za-z0-9_]+", "_", name)
-    if not candidate or candidate[0].isdigit():
-        candidate = f"field_{candidate}"
-    if not candidate.isidentifier():
-        candidate = "field"
+    if name.isascii() and name.isidentifier():
+        candidate = name
+    else:
+        candidate = _FIELD_NAME_DISALLOWED_RE.sub("_", name)
+        if not candidate or candidate[0].isdigit():
+            candidate = f"field_{candidate}"
+        if not candidate.isidentifier():
+            candidate = "field"
 
     base = candidate
     i = 2
@@ -75,14 +115,160 @@ def _redact_url(url: str) -> str:
     except Exception:
         return url
 
+# Responses of tools configured with `cache_results` / `cache_ttl` (seconds)
+_DEFAULT_CACHE_TTL_SECONDS = 60.0
+_RESPONSE_CACHE_MAXSIZE = 1024
+
+
+class _ResponseCache:
+    """Thread-safe TTL + LRU cache of successful webhook responses for one tool."""
+
+    def __init__(self, ttl: float, maxsize: int = _RESPONSE_CACHE_MAXSIZE) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(payload: dict[str, Any]) -> bytes | None:
+        """Stable digest of the request payload, or None if it is not JSON-serializable."""
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return None
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate the result; never hand out the cached one.
+        return dict(result)
+
+    def put(self, key: bytes, result: dict[str, Any]) -> None:
+        if result.get("status") == "error":
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, dict(result))
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+# Non-JSON response bodies are returned as text, capped so a misbehaving upstream
+# (e.g. a large HTML error page) can't blow up memory or the model context.
+_ERROR_BODY_MAX_BYTES = 2048
+_DEFAULT_MAX_BODY_BYTES = 8192
+
+
+def _max_body_bytes(cfg: Dict[str, Any]) -> int:
+    """Cap for non-JSON success bodies, from ``max_body_bytes`` in the tool config."""
+    try:
+        limit = int(cfg.get("max_body_bytes") or _DEFAULT_MAX_BODY_BYTES)
+    except (TypeError, ValueError):
+        return _DEFAULT_MAX_BODY_BYTES
+    return limit if limit > 0 else _DEFAULT_MAX_BODY_BYTES
+
+
+def _decode_body(content: bytes, limit: int) -> str:
+    # Decode only the bytes we keep, as UTF-8, instead of decoding the whole body
+    # with the response's detected encoding.
+    return content[:limit].decode("utf-8", errors="replace")
+
+
+def _response_cache_ttl(cfg: Dict[str, Any]) -> float:
+    """TTL in seconds for caching a tool's responses; 0 disables caching."""
+    try:
+        ttl = float(cfg.get("cache_ttl") or 0)
+    except (TypeError, ValueError):
+        ttl = 0.0
+    if ttl <= 0 and cfg.get("cache_results"):
+        ttl = _DEFAULT_CACHE_TTL_SECONDS
+    return max(ttl, 0.0)
+
+
+@lru_cache(maxsize=512)
+def _args_model_for(
+    model_name: str, field_specs: tuple[tuple[str, str, Any, bool], ...]
+) -> type[BaseModel]:
+    """Pydantic args model for (field name, alias, type, required) specs.
+
+    create_model is by far the most expensive step of building a tool; tools whose
+    configs differ only in url, headers or description share the same model.
+    """
+    fields: Dict[str, Any] = {
+        safe_name: (py_type, Field(... if is_required else None, alias=alias))
+        for safe_name, alias, py_type, is_required in field_specs
+    }
+    model_cfg = ConfigDict(populate_by_name=True, extra="ignore")
+    return create_model(model_name, __config__=model_cfg, **fields)
+
+
+@cache
+def _get_http_session() -> requests.Session:
+    """Pooled session shared by all dynamic tools so webhook connections are reused.
+
+    Retries only cover connection failures and idempotent methods: urllib3 never
+    re-sends a POST on a 5xx response, so a webhook is not triggered twice.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_http_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def _get_http_async_client() -> httpx.AsyncClient:
+    """Async counterpart of _get_http_session() used by the tools' coroutines.
+
+    An AsyncClient's pooled connections belong to the event loop that opened
+    them, so there is one client per running loop rather than one per process.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_async_clients.get(loop)
+    if client is None:
+        client = _http_async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32),
+            # requests.Session follows redirects by default; keep both paths alike
+            follow_redirects=True,
+        )
+    return client
+
+
+def _to_httpx_timeout(timeout: float | tuple[float, float]) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
 def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
     """Create a StructuredTool from a config that comes in request.context.
 
     Hardening goals:
     - Avoid provider-level failures due to invalid tool names.
     - Accept JSON Schema property names that are not valid Python identifiers.
-    - Never raise on network failures; always return a serializable error payload.
+    - Never raise on network or payload encoding failures; always return a
+      serializable error payload.
     - Provide an async implementation to avoid blocking the event loop.
+
+    Tools whose webhook is idempotent can opt into caching successful responses per
+    payload with ``cache_results: true`` (60s) or ``cache_ttl: <seconds>``.
     """
 
     if not isinstance(cfg, dict):
@@ -92,19 +278,21 @@ def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
     name, changed = _sanitize_tool_name(raw_name)
 
     url = str(cfg.get("url") or "")
-    logger.debug(
-        "dynamic_tool.build.start",
-        raw_name=raw_name or None,
-        sanitized_name=name,
-        name_changed=changed,
-        url=_redact_url(url) if url else None,
-        has_schema=bool(cfg.get("schema")),
-        has_headers=isinstance(cfg.get("headers"), dict) and len(cfg.get("headers") or {}) > 0,
-    )
+    debug_enabled = _stdlib_logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug(
+            "dynamic_tool.build.start",
+            raw_name=raw_name or None,
+            sanitized_name=name,
+            name_changed=changed,
+            url=_redact_url(url) if url else None,
+            has_schema=bool(cfg.get("schema")),
+            has_headers=isinstance(cfg.get("headers"), dict) and len(cfg.get("headers") or {}) > 0,
+        )
     _validate_url(url)
 
     description = str(cfg.get("description") or "")
-    schema = cfg.get("schema") or {"type": "object", "properties": {}}
+    schema = cfg.get("schema") or _EMPTY_OBJECT_SCHEMA
     if not isinstance(schema, dict):
         raise TypeError("Tool schema must be a dict (JSON Schema)")
 
@@ -133,64 +321,64 @@ def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
     headers = cfg.get("headers") or {}
     if not isinstance(headers, dict):
         headers = {}
-
-    logger.debug(
-        "dynamic_tool.build.schema",
-        tool_name=name,
-        properties_count=len(props) if isinstance(props, dict) else 0,
-        required_count=len(required),
-        headers_count=len(headers),
-        timeout=timeout,
-    )
+    # Payloads are encoded with orjson, so the JSON content type is set here
+    # (a content type from the config still takes precedence, whatever its case).
+    post_headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+    post_headers.update(headers)
+    max_body_bytes = _max_body_bytes(cfg)
+    cache_ttl = _response_cache_ttl(cfg)
+    response_cache = _ResponseCache(cache_ttl) if cache_ttl else None
+
+    if debug_enabled:
+        logger.debug(
+            "dynamic_tool.build.schema",
+            tool_name=name,
+            properties_count=len(props) if isinstance(props, dict) else 0,
+            required_count=len(required),
+            headers_count=len(headers),
+            timeout=timeout,
+        )
 
     # 1) Create a dynamic Pydantic model from the JSON Schema, using aliases
     used: set[str] = set()
-    fields: Dict[str, Any] = {}
+    field_specs: list[tuple[str, str, Any, bool]] = []
+    aliased = False
     for original_name, field_schema in props.items():
-        # Required comes from original JSON Schema property names
-        default = ... if original_name in required else None
-
-        # Best-effort type mapping (fallback Any)
-        json_type = None
+        py_type: Any = Any
         if isinstance(field_schema, dict):
             json_type = field_schema.get("type")
-        py_type: Any = Any
-        if json_type == "string":
-            py_type = str
-        elif json_type == "integer":
-            py_type = int
-        elif json_type == "number":
-            py_type = float
-        elif json_type == "boolean":
-            py_type = bool
-        elif json_type == "object":
-            py_type = dict
-        elif json_type == "array":
-            py_type = list
+            if isinstance(json_type, str):
+                py_type = _JSON_TYPE_MAP.get(json_type, Any)
 
         safe_name = _safe_field_name(str(original_name), used)
-        fields[safe_name] = (
-            py_type,
-            Field(default, alias=str(original_name)),
+        aliased = aliased or safe_name != original_name
+        # Required comes from original JSON Schema property names
+        field_specs.append(
+            (safe_name, str(original_name), py_type, original_name in required)
         )
 
-    model_cfg = ConfigDict(populate_by_name=True, extra="ignore")
-    ArgsModel = create_model(f"{name.capitalize()}Args", __config__=model_cfg, **fields)
-
-    def _do_post(payload: dict[str, Any]) -> dict[str, Any]:
-        started = time.monotonic()
-        try:
-            resp = requests.post(url, json=payload, headers=headers, timeout=timeout)
-        except RequestException as exc:
-            return {
-                "status": "error",
-                "error": str(exc),
-                "error_type": type(exc).__name__,
-                "url": url,
-                "timeout": timeout,
-                "elapsed_ms": int((time.monotonic() - started) * 1000),
-            }
-
+    ArgsModel = _args_model_for(f"{name.capitalize()}Args", tuple(field_specs))
+
+    def _build_payload(kwargs: dict[str, Any]) -> dict[str, Any]:
+        if aliased:
+            return ArgsModel(**kwargs).model_dump(by_alias=True, exclude_none=True)
+        # StructuredTool has already validated kwargs against ArgsModel, and with no
+        # aliases the field names are the JSON property names, so the payload can be
+        # taken as is instead of validating and dumping a model a second time.
+        return {key: value for key, value in kwargs.items() if value is not None}
+
+    def _request_failed(exc: Exception, started: float) -> dict[str, Any]:
+        return {
+            "status": "error",
+            "error": str(exc),
+            "error_type": type(exc).__name__,
+            "url": url,
+            "timeout": timeout,
+            "elapsed_ms": int((time.monotonic() - started) * 1000),
+        }
+
+    def _handle_response(resp: Any, started: float) -> dict[str, Any]:
+        # Works for both requests.Response and httpx.Response.
         elapsed_ms = int((time.monotonic() - started) * 1000)
         try:
             resp.raise_for_status()
@@ -200,18 +388,18 @@ def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
                 "error": str(exc),
                 "error_type": type(exc).__name__,
                 "status_code": getattr(resp, "status_code", None),
-                "body": getattr(resp, "text", None),
+                "body": _decode_body(resp.content, _ERROR_BODY_MAX_BYTES),
                 "url": url,
                 "elapsed_ms": elapsed_ms,
             }
 
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except ValueError:
             data = {
                 "status": "ok",
                 "status_code": resp.status_code,
-                "text": resp.text,
+                "text": _decode_body(resp.content, max_body_bytes),
             }
 
         if isinstance(data, dict):
@@ -220,15 +408,62 @@ def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
         # Ensure tool output is always JSON-serializable (dict/str)
         return {"status": "ok", "data": data, "elapsed_ms": elapsed_ms}
 
+    def _do_post(payload: dict[str, Any]) -> dict[str, Any]:
+        started = time.monotonic()
+        try:
+            body = orjson.dumps(payload)
+        except orjson.JSONEncodeError as exc:
+            return _request_failed(exc, started)
+        try:
+            resp = _get_http_session().post(
+                url, data=body, headers=post_headers, timeout=timeout
+            )
+        except RequestException as exc:
+            return _request_failed(exc, started)
+        return _handle_response(resp, started)
+
+    async def _ado_post(payload: dict[str, Any]) -> dict[str, Any]:
+        started = time.monotonic()
+        try:
+            body = orjson.dumps(payload)
+        except orjson.JSONEncodeError as exc:
+            return _request_failed(exc, started)
+        try:
+            resp = await _get_http_async_client().post(
+                url,
+                content=body,
+                headers=post_headers,
+                timeout=_to_httpx_timeout(timeout),
+            )
+        except httpx.HTTPError as exc:
+            return _request_failed(exc, started)
+        return _handle_response(resp, started)
+
     # 2) Functions that will make the POST to the webhook
     def _func(**kwargs):
         # kwargs are validated against ArgsModel by StructuredTool
-        payload = ArgsModel(**kwargs).model_dump(by_alias=True, exclude_none=True)
-        return _do_post(payload)
+        payload = _build_payload(kwargs)
+        cache_key = _ResponseCache.key(payload) if response_cache else None
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        result = _do_post(payload)
+        if cache_key is not None:
+            response_cache.put(cache_key, result)
+        return result
 
     async def _afunc(**kwargs):
-        payload = ArgsModel(**kwargs).model_dump(by_alias=True, exclude_none=True)
-        return await anyio.to_thread.run_sync(_do_post, payload)
+        payload = _build_payload(kwargs)
+        cache_key = _ResponseCache.key(payload) if response_cache else None
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        result = await _ado_post(payload)
+        if cache_key is not None:
+            response_cache.put(cache_key, result)
+        return result
 
     # 3) Create the StructuredTool (sync + async)
     tool_description = description
@@ -246,8 +481,20 @@ def build_tool_from_config(cfg: Dict[str, Any]) -> StructuredTool:
         args_schema=ArgsModel,
     )
 
-    # Keep originals for debugging/telemetry
-    tool.metadata = {"original_name": raw_name, "url": url}
+    # Keep originals for debugging/telemetry, plus the OpenAI-style function spec the
+    # middleware binds to the model (built once here rather than on every model call)
+    tool.metadata = {
+        "original_name": raw_name,
+        "url": url,
+        "llm_spec": {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": schema,
+            },
+        },
+    }
     logger.info(
         "dynamic_tool.build.succeeded",
         tool_name=name,
@@ -1,13 +1,60 @@
 """Knowledge base tools with assistant-scoped filtering."""
 
 import hashlib
+import os
 from datetime import UTC, datetime
 from typing import Annotated, Any
 
+import structlog
 from langchain_core.tools import tool
 from langgraph.config import get_config
 from langgraph.prebuilt import InjectedStore
 
+from graphs.dragon_chat_agent.utils.search_cache import SearchResultCache
+
+logger = structlog.get_logger(__name__)
+
+
+def _search_cache_ttl() -> float:
+    """Seconds a search result may be reused; 0 (the default) disables the cache."""
+    try:
+        return max(float(os.getenv("KB_SEARCH_CACHE_TTL", "0")), 0.0)
+    except ValueError:
+        return 0.0
+
+
+# Recent search results per assistant, keyed by normalized query text. The
+# store embeds queries inside asearch and can't take a precomputed vector, so an
+# exact (normalized) match is what lets a hit skip both embedding and search.
+_search_cache = SearchResultCache(ttl=_search_cache_ttl())
+
+
+def _knowledge_key(title: str, content: str) -> str:
+    """Derive the store key of a knowledge entry from its title and content start."""
+    # Not security sensitive: BLAKE2b is just faster than MD5 at the same 128 bits
+    h = hashlib.blake2b(title.encode(), digest_size=16)
+    h.update(b"\x00")
+    h.update(content[:50].encode())
+    return h.hexdigest()
+
+
+_RESULT_TEMPLATE = "**{}. {}**\n{}\n_Almacenado: {}_"
+_PREVIEW_CHARS = 500
+
+
+def _format_result(position: int, result: Any) -> str:
+    # Extraer el contenido del valor almacenado
+    value = result.value if isinstance(result.value, dict) else {}
+    content = value.get("content")
+    if content is None:
+        content = str(result.value)
+    # Truncar contenido si es muy largo
+    if len(content) > _PREVIEW_CHARS:
+        content = content[:_PREVIEW_CHARS] + "..."
+    return _RESULT_TEMPLATE.format(
+        position, value.get("title", "Sin título"), content, value.get("timestamp", "")
+    )
+
 
 @tool
 async def search_knowledge_base(
@@ -36,9 +83,12 @@ async def search_knowledge_base(
     # Si no hay external_assistant_id, usar el assistant_id local
     assistant_id = external_assistant_id or configurable.get("assistant_id")
     
-    print(f"Assistant ID (local): {configurable.get('assistant_id')}")
-    print(f"External Assistant ID: {external_assistant_id}")
-    print(f"Using Assistant ID for namespace: {assistant_id}")
+    logger.debug(
+        "knowledge_base.search",
+        local_assistant_id=configurable.get("assistant_id"),
+        external_assistant_id=external_assistant_id,
+        namespace_assistant_id=assistant_id,
+    )
 
     if not assistant_id:
         return "Error: No se identificó el asistente. Verifica que el sistema esté configurado correctamente."
@@ -47,6 +97,11 @@ async def search_knowledge_base(
     # Estructura: ("knowledge", assistant_id)
     namespace = ("knowledge", assistant_id)
 
+    if _search_cache.enabled:
+        cached = _search_cache.get(namespace, query)
+        if cached is not None:
+            return cached
+
     # Búsqueda semántica usando embeddings
     # El store.asearch usa los embeddings configurados en aegra.json
     results = await store.asearch(namespace, query=query, limit=5)
@@ -55,22 +110,12 @@ async def search_knowledge_base(
         return "No encontré información relevante en la base de conocimientos. Puedes proporcionarme información para almacenarla usando store_knowledge."
 
     # Formatear resultados
-    formatted_results = []
-    for i, result in enumerate(results, 1):
-        # Extraer el contenido del valor almacenado
-        value: dict[str, Any] = result.value if isinstance(result.value, dict) else {}
-        title = value.get("title", "Sin título")
-        content = value.get("content", str(result.value))
-        timestamp = value.get("timestamp", "")
-
-        # Truncar contenido si es muy largo
-        content_preview = content[:500] + "..." if len(content) > 500 else content
-
-        formatted_results.append(
-            f"**{i}. {title}**\n{content_preview}\n_Almacenado: {timestamp}_"
-        )
-
-    return "\n\n".join(formatted_results)
+    formatted = "\n\n".join(
+        _format_result(i, result) for i, result in enumerate(results, 1)
+    )
+    if _search_cache.enabled:
+        _search_cache.put(namespace, query, formatted)
+    return formatted
 
 
 @tool
@@ -108,7 +153,7 @@ async def store_knowledge(
     namespace = ("knowledge", assistant_id)
 
     # Generar un ID único para este conocimiento basado en título y contenido
-    key = hashlib.md5(f"{title}_{content[:50]}".encode()).hexdigest()
+    key = _knowledge_key(title, content)
 
     # Almacenar (los embeddings se generan automáticamente)
     # El sistema usa el modelo configurado en aegra.json (ej: openai:text-embedding-3-small)
@@ -121,5 +166,7 @@ async def store_knowledge(
             "timestamp": datetime.now(UTC).isoformat(),
         },
     )
+    # Las búsquedas cacheadas pueden haber quedado desactualizadas
+    _search_cache.invalidate(namespace)
 
     return f"✓ Conocimiento almacenado exitosamente:\n- Título: {title}\n- ID: {key}\n\nPuedes recuperarlo más tarde con search_knowledge_base."
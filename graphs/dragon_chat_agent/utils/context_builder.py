@@ -4,6 +4,20 @@ from typing import Dict, Any
 
 from graphs.dragon_chat_agent.utils.datetime_utils import get_current_zulu_datetime
 
+_CONTACT_KEYS = frozenset(("whatsapp_contact_name", "whatsapp_contact_number"))
+
+_DATETIME_SECTION = "\n\n## Información de contexto:\n- Fecha y hora actual: {}\n"
+
+_KB_INSTRUCTIONS = """
+
+## Instrucciones de Base de Conocimientos
+IMPORTANTE: Tienes acceso a una base de conocimientos específica mediante la herramienta `search_knowledge_base`.
+- SIEMPRE busca en la base de conocimientos PRIMERO cuando el usuario haga preguntas sobre productos, servicios, políticas, procedimientos, o cualquier información que pueda estar documentada.
+- Usa el resultado de la búsqueda como FUENTE PRINCIPAL de tu respuesta.
+- Si la búsqueda retorna resultados relevantes, DEBES basar tu respuesta en esa información.
+- Solo responde con conocimiento general si la búsqueda no encuentra información relevante.
+"""
+
 
 def build_user_context_section(metadata: Dict[str, Any]) -> str:
     """
@@ -26,26 +40,21 @@ def build_user_context_section(metadata: Dict[str, Any]) -> str:
     contact_number = metadata.get("whatsapp_contact_number")
     
     if contact_name or contact_number:
-        user_info = []
+        context_parts.append("## Datos del usuario:")
         if contact_name:
-            user_info.append(f"Nombre: {contact_name}")
+            context_parts.append(f"  - Nombre: {contact_name}")
         if contact_number:
-            user_info.append(f"Número de contacto: {contact_number}")
-        
-        if user_info:
-            context_parts.append("## Datos del usuario:")
-            context_parts.extend(f"  - {info}" for info in user_info)
+            context_parts.append(f"  - Número de contacto: {contact_number}")
     
     # Add any other metadata fields
-    other_metadata = {
-        k: v for k, v in metadata.items()
-        if k not in ("whatsapp_contact_name", "whatsapp_contact_number")
-    }
-    
-    if other_metadata:
-        context_parts.append("## Información adicional:")
-        for key, value in other_metadata.items():
-            context_parts.append(f"  - {key}: {value}")
+    header_added = False
+    for key, value in metadata.items():
+        if key in _CONTACT_KEYS:
+            continue
+        if not header_added:
+            context_parts.append("## Información adicional:")
+            header_added = True
+        context_parts.append(f"  - {key}: {value}")
     
     if context_parts:
         return "\n\n" + "\n".join(context_parts) + "\n"
@@ -62,7 +71,7 @@ def build_datetime_context_section(current_datetime: str | None = None) -> str:
     """
     if not current_datetime:
         current_datetime = get_current_zulu_datetime()
-    return f"\n\n## Información de contexto:\n- Fecha y hora actual: {current_datetime}\n"
+    return _DATETIME_SECTION.format(current_datetime)
 
 
 def build_knowledge_base_instructions(has_knowledge_base: bool = False) -> str:
@@ -78,13 +87,4 @@ def build_knowledge_base_instructions(has_knowledge_base: bool = False) -> str:
     if not has_knowledge_base:
         return ""
 
-    return """
-
-## Instrucciones de Base de Conocimientos
-IMPORTANTE: Tienes acceso a una base de conocimientos específica mediante la herramienta `search_knowledge_base`.
-- SIEMPRE busca en la base de conocimientos PRIMERO cuando el usuario haga preguntas sobre productos, servicios, políticas, procedimientos, o cualquier información que pueda estar documentada.
-- Usa el resultado de la búsqueda como FUENTE PRINCIPAL de tu respuesta.
-- Si la búsqueda retorna resultados relevantes, DEBES basar tu respuesta en esa información.
-- Solo responde con conocimiento general si la búsqueda no encuentra información relevante.
-"""
-
+    return _KB_INSTRUCTIONS
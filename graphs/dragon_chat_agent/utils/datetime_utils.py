@@ -1,7 +1,12 @@
 """Utilities for date and time formatting."""
 
+import time
 from datetime import datetime, timezone
 
+# (epoch second, formatted string) of the last call; the format has second
+# resolution, so every call within the same second returns the same string.
+_zulu_cache: tuple[int, str] = (-1, "")
+
 
 def get_current_zulu_datetime() -> str:
     """
@@ -10,14 +15,10 @@ def get_current_zulu_datetime() -> str:
     Returns:
         String in format: YYYYMMDDTHHMMSSZ (e.g., "20240115T143022Z")
     """
-    now = datetime.now(timezone.utc)
-    
-    year = now.year
-    month = f"{now.month:02d}"
-    day = f"{now.day:02d}"
-    hours = f"{now.hour:02d}"
-    minutes = f"{now.minute:02d}"
-    seconds = f"{now.second:02d}"
-    
-    return f"{year}{month}{day}T{hours}{minutes}{seconds}Z"
-
+    global _zulu_cache
+    now = int(time.time())
+    cached = _zulu_cache
+    if cached[0] != now:
+        cached = (now, datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+        _zulu_cache = cached
+    return cached[1]
@@ -6,6 +6,15 @@ logger = structlog.get_logger(__name__)
 
 default_instructions = """You are a helpful assistant that answers concisely"""
 
+
+def _prompt_cache_ttl() -> int:
+    """Seconds the Langfuse SDK may serve a prompt from its own cache."""
+    try:
+        return int(os.getenv("LANGFUSE_PROMPT_TTL", "300"))
+    except ValueError:
+        return 300
+
+
 def _is_langfuse_tracing_enabled() -> bool:
     """Check if Langfuse tracing is enabled via environment variable."""
     return os.getenv("LANGFUSE_TRACING", "false").lower() in ("true", "1", "yes")
@@ -26,7 +35,9 @@ def fetch_system_prompt(prompt_id: str) -> str:
             from langfuse import get_client
 
             lf_client = get_client()
-            lf_prompt = lf_client.get_prompt(prompt_id)
+            lf_prompt = lf_client.get_prompt(
+                prompt_id, cache_ttl_seconds=_prompt_cache_ttl()
+            )
             if lf_prompt and getattr(lf_prompt, "prompt", None):
                 return lf_prompt.prompt
             else:
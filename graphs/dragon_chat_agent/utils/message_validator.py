@@ -19,61 +19,54 @@ def validate_and_clean_messages(messages: List[Any]) -> List[Any]:
         
     Returns:
         List of messages with ToolMessage error responses added for any missing
-        tool call responses
+        tool call responses. When nothing needs to be added, the input list itself
+        is returned, so callers can detect changes with an identity check.
     """
     if not messages:
         return messages
-    
-    cleaned_messages = []
-    
-    for i, message in enumerate(messages):
-        if isinstance(message, AIMessage) and hasattr(message, "tool_calls") and message.tool_calls:
-            tool_call_info = {
-                tc.get("id"): {
-                    "id": tc.get("id"),
-                    "name": tc.get("name", "unknown"),
-                }
-                for tc in message.tool_calls
-                if tc.get("id")
-            }
-            
-            if not tool_call_info:
-                cleaned_messages.append(message)
-                continue
-            
-            tool_call_ids = set(tool_call_info.keys())
-            
-            found_tool_call_ids = set()
-            for j in range(i + 1, len(messages)):
-                next_msg = messages[j]
-                if isinstance(next_msg, ToolMessage):
-                    tool_call_id = getattr(next_msg, "tool_call_id", None)
-                    if tool_call_id in tool_call_ids:
-                        found_tool_call_ids.add(tool_call_id)
-                elif isinstance(next_msg, AIMessage):
-                    break
-            
-            cleaned_messages.append(message)
-            
-            # Check if all tool calls have responses
-            missing_tool_call_ids = tool_call_ids - found_tool_call_ids
-            if missing_tool_call_ids:
-                logger.warning(
-                    "Found AIMessage with tool_calls but missing ToolMessage responses "
-                    f"for tool_call_ids: {missing_tool_call_ids}. Adding error ToolMessages."
-                )
-                
-                for tool_call_id in missing_tool_call_ids:
-                    tool_info = tool_call_info[tool_call_id]
-                    tool_name = tool_info.get("name", "unknown")
-                    error_message = ToolMessage(
-                        content=f"❌ Error al llamar a la herramienta '{tool_name}'. La herramienta no respondió correctamente.",
-                        tool_call_id=tool_call_id,
-                        name=tool_name,
-                    )
-                    cleaned_messages.append(error_message)
-        else:
+
+    # Single pass: tool calls of the latest AIMessage stay pending until their
+    # ToolMessage shows up; whatever is still pending at the next AIMessage (or
+    # at the end) gets an error ToolMessage right after its AIMessage.
+    cleaned_messages: List[Any] = []
+    changed = False
+    pending: dict[str, str] = {}
+    insert_at = 0
+
+    def _flush_pending() -> None:
+        nonlocal changed
+        logger.warning(
+            "Found AIMessage with tool_calls but missing ToolMessage responses "
+            f"for tool_call_ids: {set(pending)}. Adding error ToolMessages."
+        )
+        changed = True
+        cleaned_messages[insert_at:insert_at] = [
+            ToolMessage(
+                content=f"❌ Error al llamar a la herramienta '{tool_name}'. La herramienta no respondió correctamente.",
+                tool_call_id=tool_call_id,
+                name=tool_name,
+            )
+            for tool_call_id, tool_name in pending.items()
+        ]
+        pending.clear()
+
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            if pending:
+                pending.pop(getattr(message, "tool_call_id", None), None)
+        elif isinstance(message, AIMessage):
+            if pending:
+                _flush_pending()
+            for tc in getattr(message, "tool_calls", None) or ():
+                tool_call_id = tc.get("id")
+                if tool_call_id:
+                    pending[tool_call_id] = tc.get("name", "unknown")
             cleaned_messages.append(message)
-    
-    return cleaned_messages
+            insert_at = len(cleaned_messages)
+            continue
+        cleaned_messages.append(message)
+
+    if pending:
+        _flush_pending()
 
+    return cleaned_messages if changed else messages
@@ -0,0 +1,84 @@
+"""In-process cache of knowledge base search results.
+
+Chat users often repeat the same question within a conversation. The cache keeps
+recent formatted answers per namespace, keyed by the normalized query text, so a
+repeated question skips both the query embedding and the vector search.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Leading/trailing punctuation that doesn't change what is being asked
+_QUERY_PUNCTUATION = "¿?¡!.,;: "
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, collapse whitespace and strip surrounding punctuation."""
+    return " ".join(query.casefold().split()).strip(_QUERY_PUNCTUATION)
+
+
+class SearchResultCache:
+    """LRU cache of (normalized query -> result) entries, scoped by namespace.
+
+    Holds up to ``capacity`` entries for each of the ``max_namespaces`` most
+    recently used namespaces. Entries expire after ``ttl`` seconds so writes that
+    bypass ``invalidate()`` (e.g. through the store API) are picked up eventually;
+    a ``ttl`` of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        capacity: int = 32,
+        max_namespaces: int = 128,
+    ) -> None:
+        self.ttl = ttl
+        self.capacity = capacity
+        self.max_namespaces = max_namespaces
+        # namespace -> normalized query -> (expires_at, result)
+        self._entries: OrderedDict[Any, OrderedDict[str, tuple[float, str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.capacity > 0
+
+    def get(self, namespace: Any, query: str) -> str | None:
+        key = normalize_query(query)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            if not entries:
+                return None
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del entries[key]
+                return None
+            self._entries.move_to_end(namespace)
+            entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, namespace: Any, query: str, result: str) -> None:
+        key = normalize_query(query)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            if entries is None:
+                entries = self._entries[namespace] = OrderedDict()
+                if len(self._entries) > self.max_namespaces:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(namespace)
+            entries[key] = (time.monotonic() + self.ttl, result)
+            entries.move_to_end(key)
+            while len(entries) > self.capacity:
+                entries.popitem(last=False)
+
+    def invalidate(self, namespace: Any) -> None:
+        """Drop every entry of a namespace, e.g. after new knowledge was stored."""
+        with self._lock:
+            self._entries.pop(namespace, None)
@@ -1,9 +1,10 @@
 """Store endpoints for Agent Protocol"""
 
-import json
+import re
 from typing import Any, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from ..core.auth_deps import get_current_user
 from ..models import (
@@ -15,8 +16,17 @@ from ..models import (
     StoreSearchResponse,
     User,
 )
+from ..services.store_batcher import store_write_batcher
 
-router = APIRouter()
+# Store items can be large; orjson serializes them straight to bytes
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Lone surrogates: a high surrogate (U+D800-U+DBFF) not followed by a low one, or a
+# low surrogate (U+DC00-U+DFFF) not preceded by a high one. Paired surrogates
+# encode characters outside the BMP and are kept.
+_LONE_SURROGATE_RE = re.compile(
+    "[\ud800-\udbff](?![\udc00-\udfff])|(?<![\ud800-\udbff])[\udc00-\udfff]"
+)
 
 
 def clean_unicode_surrogates(value: Any) -> Any:
@@ -33,44 +43,17 @@ def clean_unicode_surrogates(value: Any) -> Any:
         The cleaned value with invalid surrogates removed
     """
     if isinstance(value, str):
-        # Remove invalid surrogate pairs
-        # High surrogates: U+D800 to U+DBFF
-        # Low surrogates: U+DC00 to U+DFFF
-        # Valid surrogate pairs encode characters outside the BMP (U+10000 to U+10FFFF)
-        cleaned_chars = []
-        i = 0
-        while i < len(value):
-            char = value[i]
-            code_point = ord(char)
-            
-            # Check if it's a high surrogate
-            if 0xD800 <= code_point <= 0xDBFF:
-                # Check if next char is a valid low surrogate
-                if i + 1 < len(value):
-                    next_code = ord(value[i + 1])
-                    if 0xDC00 <= next_code <= 0xDFFF:
-                        # Valid surrogate pair - keep both
-                        cleaned_chars.append(char)
-                        cleaned_chars.append(value[i + 1])
-                        i += 2
-                        continue
-                # Invalid: high surrogate without low surrogate - skip it
-                i += 1
-                continue
-            # Check if it's a low surrogate without preceding high surrogate
-            elif 0xDC00 <= code_point <= 0xDFFF:
-                # Invalid: low surrogate without high surrogate - skip it
-                i += 1
-                continue
-            else:
-                # Valid character - keep it
-                cleaned_chars.append(char)
-                i += 1
-        
-        return "".join(cleaned_chars)
+        # ASCII strings (most keys and values) cannot contain surrogates
+        if value.isascii():
+            return value
+        return _LONE_SURROGATE_RE.sub("", value)
     elif isinstance(value, dict):
+        if not value:
+            return {}
         return {k: clean_unicode_surrogates(v) for k, v in value.items()}
     elif isinstance(value, (list, tuple)):
+        if not value:
+            return []
         return [clean_unicode_surrogates(item) for item in value]
     else:
         # For other types (int, float, bool, None), return as-is
@@ -95,8 +78,9 @@ async def put_store_item(
     # PostgreSQL's JSON type is strict and rejects invalid surrogates
     cleaned_value = clean_unicode_surrogates(request.value)
 
-    await store.aput(
-        namespace=tuple(scoped_namespace), key=request.key, value=cleaned_value
+    # Concurrent writes are embedded and inserted together
+    await store_write_batcher.put(
+        store, scoped_namespace, request.key, cleaned_value
     )
 
     return {"status": "stored"}
@@ -127,7 +111,7 @@ async def get_store_item(
 
     store = db_manager.get_store()
 
-    item = await store.aget(tuple(scoped_namespace), key)
+    item = await store.aget(scoped_namespace, key)
 
     if not item:
         raise HTTPException(404, "Item not found")
@@ -165,7 +149,7 @@ async def delete_store_item(
 
     store = db_manager.get_store()
 
-    await store.adelete(tuple(scoped_namespace), k)
+    await store.adelete(scoped_namespace, k)
 
     return {"status": "deleted"}
 
@@ -189,7 +173,7 @@ async def search_store_items(
     # Search with LangGraph store
     # asearch takes namespace_prefix as a positional-only argument
     results = await store.asearch(
-        tuple(scoped_prefix),
+        scoped_prefix,
         query=request.query,
         limit=request.limit or 20,
         offset=request.offset or 0,
@@ -208,16 +192,13 @@ async def search_store_items(
     )
 
 
-def apply_user_namespace_scoping(user_id: str, namespace: list[str]) -> list[str]:
+def apply_user_namespace_scoping(user_id: str, namespace: list[str]) -> tuple[str, ...]:
     """Apply user-based namespace scoping for data isolation"""
 
     if not namespace:
         # Default to user's private namespace
-        return ["users", user_id]
-
-    # Allow explicit user namespaces
-    if namespace[0] == "users" and len(namespace) >= 2 and namespace[1] == user_id:
-        return namespace
+        return ("users", user_id)
 
-    # For development, allow all namespaces (remove this for production)
-    return namespace
+    # Explicit user namespaces (["users", user_id, ...]) are used as given.
+    # For development, all other namespaces are allowed too (remove this for production)
+    return tuple(namespace)
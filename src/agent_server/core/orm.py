@@ -13,15 +13,21 @@ Nothing is auto-imported by FastAPI yet; routers will `from ...core.db import ge
 
 from __future__ import annotations
 
+import hashlib
 from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
+import orjson
 from sqlalchemy import (
     TIMESTAMP,
+    BigInteger,
     ForeignKey,
     Index,
     Integer,
     Text,
+    event,
+    inspect,
     text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -42,6 +48,8 @@ class Assistant(Base):
     description: Mapped[str | None] = mapped_column(Text)
     graph_id: Mapped[str] = mapped_column(Text, nullable=False)
     config: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
+    # Digest of config written by the application, see assistant_config_hash()
+    config_hash: Mapped[int | None] = mapped_column(BigInteger)
     context: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     user_id: Mapped[str] = mapped_column(Text, nullable=False)
     version: Mapped[int] = mapped_column(
@@ -58,17 +66,47 @@ class Assistant(Base):
     )
 
     # Indexes for performance
-    # Note: idx_assistant_user_graph_config is created as a functional index
-    # using MD5 hash of config in migration 20260112170959 to avoid btree size limits
+    # Note: config is indexed through its digest (config_hash) rather than directly
+    # to avoid btree row size limits on large configs
     __table_args__ = (
         Index("idx_assistant_user", "user_id"),
         Index("idx_assistant_user_assistant", "user_id", "assistant_id", unique=True),
-        # idx_assistant_user_graph_config is created via migration as functional index:
-        # CREATE UNIQUE INDEX idx_assistant_user_graph_config 
-        # ON assistant (user_id, graph_id, md5(config::text))
+        Index(
+            "idx_assistant_user_graph_config",
+            "user_id",
+            "graph_id",
+            "config_hash",
+            unique=True,
+        ),
     )
 
 
+def assistant_config_hash(config: dict[str, Any] | None) -> int:
+    """Digest stored in ``Assistant.config_hash`` for a given config.
+
+    Keys are sorted before hashing so equal configs always hash the same.
+    The 8-byte BLAKE2b digest is stored as a signed bigint to keep the
+    idx_assistant_user_graph_config entries small. Equality lookups on config
+    should compare this value so they probe that index instead of comparing
+    JSONB row by row.
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(config or {}, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@event.listens_for(Assistant, "before_insert")
+def _hash_config_on_insert(_mapper, _connection, target: Assistant) -> None:
+    target.config_hash = assistant_config_hash(target.config)
+
+
+@event.listens_for(Assistant, "before_update")
+def _hash_config_on_update(_mapper, _connection, target: Assistant) -> None:
+    if inspect(target).attrs.config.history.has_changes():
+        target.config_hash = assistant_config_hash(target.config)
+
+
 class AssistantVersion(Base):
     __tablename__ = "assistant_versions"
 
@@ -50,6 +50,7 @@ from .observability.base import get_observability_manager
 from .observability.langfuse_integration import _langfuse_provider
 from .services.event_store import event_store
 from .services.langgraph_service import get_langgraph_service
+from .services.store_batcher import store_write_batcher
 from .utils.setup_logging import setup_logging
 
 # Task management for run cancellation
@@ -76,6 +77,9 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     # Initialize event store cleanup task
     await event_store.start_cleanup_task()
 
+    # Batch store writes so their embeddings are requested together
+    await store_write_batcher.start()
+
     yield
 
     # Shutdown: Clean up connections and cancel active runs
@@ -86,6 +90,9 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     # Stop event store cleanup task
     await event_store.stop_cleanup_task()
 
+    # Flush pending store writes while the database is still available
+    await store_write_batcher.stop()
+
     await db_manager.close()
 
 
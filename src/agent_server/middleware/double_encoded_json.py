@@ -1,10 +1,77 @@
-import json
+import os
+import re
 
+import orjson
 import structlog
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = structlog.getLogger(__name__)
 
+# A double-encoded payload is a JSON string wrapping an object or array, so it
+# opens with '"{' or '"[' (whitespace aside) and closes with '}"' or ']"'.
+# Matching in place avoids copying the body the way bytes.lstrip() would.
+_JSON_STRING_START_RE = re.compile(rb'[ \t\r\n]*"[ \t\r\n]*[{\[]')
+_JSON_WHITESPACE = b" \t\r\n"
+
+# Comma-separated path prefixes the middleware is limited to (empty = all paths)
+_DOUBLE_ENCODED_PATHS = tuple(
+    prefix
+    for prefix in (
+        part.strip() for part in os.getenv("DOUBLE_ENCODED_JSON_PATHS", "").split(",")
+    )
+    if prefix
+)
+
+_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+# HTTP/2+ may send a body without content-length or chunked encoding
+_LENGTH_DELIMITED_HTTP_VERSIONS = frozenset(("1.0", "1.1"))
+
+
+def _looks_like_double_encoded(body: bytes) -> bool:
+    """Cheap check of both ends of the body, before paying for a parse."""
+    end = len(body) - 1
+    while end >= 0 and body[end] in _JSON_WHITESPACE:
+        end -= 1
+    if body[end : end + 1] != b'"':
+        return False
+    end -= 1
+    while end >= 0 and body[end] in _JSON_WHITESPACE:
+        end -= 1
+    return (
+        body[end : end + 1] in (b"}", b"]")
+        and _JSON_STRING_START_RE.match(body) is not None
+    )
+
+
+def _set_content_length(scope: Scope, length: int) -> None:
+    """Point the content-length header at a rewritten body, editing only that header."""
+    headers = scope.get("headers")
+    if not isinstance(headers, list):
+        headers = scope["headers"] = list(headers or ())
+    value = b"%d" % length
+    for i, (name, _) in enumerate(headers):
+        if name == b"content-length":
+            headers[i] = (name, value)
+            return
+    headers.append((b"content-length", value))
+
+
+class _ReplayReceive:
+    """ASGI receive callable that replays buffered body messages first."""
+
+    __slots__ = ("_messages", "_receive")
+
+    def __init__(self, messages: list[Message], receive: Receive):
+        self._messages = iter(messages)
+        self._receive = receive
+
+    async def __call__(self) -> Message:
+        message = next(self._messages, None)
+        if message is not None:
+            return message
+        # After body is sent, wait for disconnect
+        return await self._receive()
+
 
 class DoubleEncodedJSONMiddleware:
     """Middleware to handle double-encoded JSON payloads from frontend.
@@ -14,12 +81,22 @@ class DoubleEncodedJSONMiddleware:
     This middleware detects and corrects such cases.
     """
 
-    def __init__(self, app: ASGIApp):
-        self.app = app
-
     # Paths to skip - these have large payloads that shouldn't be re-processed
     SKIP_PATHS = {"/store/items", "/store/items/search"}
 
+    # Bodies declared larger than this are streamed through without buffering
+    MAX_INSPECT_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_inspect_bytes: int = MAX_INSPECT_BYTES,
+        paths: tuple[str, ...] = _DOUBLE_ENCODED_PATHS,
+    ):
+        self.app = app
+        self.max_inspect_bytes = max_inspect_bytes
+        self.paths = paths
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
             await self.app(scope, receive, send)
@@ -27,21 +104,52 @@ class DoubleEncodedJSONMiddleware:
 
         # Skip certain paths entirely to avoid body processing issues
         path = scope.get("path", "")
-        if path in self.SKIP_PATHS:
+        if path in self.SKIP_PATHS or (self.paths and not path.startswith(self.paths)):
             await self.app(scope, receive, send)
             return
 
         method = scope["method"]
-        headers = dict(scope.get("headers", []))
-        content_type = headers.get(b"content-type", b"").decode("latin1")
+        content_type = b""
+        content_length = b""
+        transfer_encoding = b""
+        if method in _BODY_METHODS:
+            # ASGI header names are lowercase; stop once both headers are found
+            for name, value in scope.get("headers", ()):
+                if name == b"content-type":
+                    content_type = value
+                elif name == b"content-length":
+                    content_length = value
+                elif name == b"transfer-encoding":
+                    transfer_encoding = value
+                else:
+                    continue
+                if content_type and content_length:
+                    break
+
+        if content_length.isdigit():
+            declared_length = int(content_length)
+            # Nothing to fix in an empty body; large ones are streamed through
+            if declared_length == 0 or declared_length > self.max_inspect_bytes:
+                await self.app(scope, receive, send)
+                return
+        elif (
+            not content_length
+            and b"chunked" not in transfer_encoding
+            and scope.get("http_version") in _LENGTH_DELIMITED_HTTP_VERSIONS
+        ):
+            # HTTP/1.x requests without either header carry no body
+            await self.app(scope, receive, send)
+            return
 
         # Only process JSON content types for POST/PUT/PATCH
-        if method in ["POST", "PUT", "PATCH"] and "application/json" in content_type:
+        if b"application/json" in content_type:
             # First, collect the entire body
+            body_messages = []
             body_parts = []
             while True:
                 message = await receive()
                 if message["type"] == "http.request":
+                    body_messages.append(message)
                     body_parts.append(message.get("body", b""))
                     if not message.get("more_body", False):
                         break
@@ -53,24 +161,26 @@ class DoubleEncodedJSONMiddleware:
             body = b"".join(body_parts)
             processed_body = body  # Default: unchanged
 
-            if body:
+            # Skip parsing anything that isn't a quoted object or array
+            if body and _looks_like_double_encoded(body):
                 try:
-                    decoded = body.decode("utf-8")
-                    parsed = json.loads(decoded)
+                    parsed = orjson.loads(body)
 
                     # Only re-serialize if the JSON was double-encoded
                     # (i.e., the first parse returned a string)
                     if isinstance(parsed, str):
                         # Double-encoded: parse again and re-serialize
-                        inner_parsed = json.loads(parsed)
-                        processed_body = json.dumps(inner_parsed).encode("utf-8")
+                        inner_parsed = orjson.loads(parsed)
+                        processed_body = orjson.dumps(inner_parsed)
+                        # Only a rewritten body needs its content-length updated
+                        _set_content_length(scope, len(processed_body))
                         logger.debug(
                             "Detected and fixed double-encoded JSON",
                             path=path,
                             original_length=len(body),
                             new_length=len(processed_body),
                         )
-                except (json.JSONDecodeError, ValueError, UnicodeDecodeError) as e:
+                except (orjson.JSONDecodeError, orjson.JSONEncodeError) as e:
                     # Not valid JSON or not double-encoded, pass through unchanged
                     logger.debug(
                         "JSON processing skipped",
@@ -78,33 +188,12 @@ class DoubleEncodedJSONMiddleware:
                         error=str(e),
                     )
 
-            # Update content-length header if body changed
-            if processed_body != body:
-                new_headers = [
-                    (name, value)
-                    for name, value in scope.get("headers", [])
-                    if name.lower() not in (b"content-length",)
+            # Replay the messages already received, untouched unless the body was
+            # rewritten, in which case a single message carries the new body
+            if processed_body is not body:
+                body_messages = [
+                    {"type": "http.request", "body": processed_body, "more_body": False}
                 ]
-                new_headers.append(
-                    (b"content-length", str(len(processed_body)).encode())
-                )
-                scope["headers"] = new_headers
-
-            # Create a receive function that returns the processed body once
-            body_sent = False
-
-            async def receive_wrapper() -> dict:
-                nonlocal body_sent
-                if not body_sent:
-                    body_sent = True
-                    return {
-                        "type": "http.request",
-                        "body": processed_body,
-                        "more_body": False,
-                    }
-                # After body is sent, wait for disconnect
-                return await receive()
-
-            await self.app(scope, receive_wrapper, send)
+            await self.app(scope, _ReplayReceive(body_messages, receive), send)
         else:
             await self.app(scope, receive, send)
@@ -25,7 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.orm import Assistant as AssistantORM
 from ..core.orm import AssistantVersion as AssistantVersionORM
-from ..core.orm import get_session
+from ..core.orm import assistant_config_hash, get_session
 from ..models import Assistant, AssistantCreate, AssistantUpdate
 from ..services.langgraph_service import LangGraphService, get_langgraph_service
 
@@ -180,11 +180,15 @@ class AssistantService:
         # Generate name if not provided
         name = request.name or f"Assistant for {graph_id}"
 
-        # Check if an assistant already exists for this user, graph and config pair
+        # Check if an assistant already exists for this user, graph and config pair.
+        # The hash probes the index; comparing config too means a 64-bit hash
+        # collision can never return another config's assistant.
         existing_stmt = select(AssistantORM).where(
             AssistantORM.user_id == user_identity,
             or_(
-                (AssistantORM.graph_id == graph_id) & (AssistantORM.config == config),
+                (AssistantORM.graph_id == graph_id)
+                & (AssistantORM.config_hash == assistant_config_hash(config))
+                & (AssistantORM.config == config),
                 AssistantORM.assistant_id == assistant_id,
             ),
         )
@@ -381,6 +385,7 @@ class AssistantService:
                 description=new_version_details["description"],
                 graph_id=new_version_details["graph_id"],
                 config=new_version_details["config"],
+                config_hash=assistant_config_hash(new_version_details["config"]),
                 context=new_version_details["context"],
                 version=new_version,
                 updated_at=now,
@@ -439,6 +444,7 @@ class AssistantService:
                 name=assistant_version.name,
                 description=assistant_version.description,
                 config=assistant_version.config,
+                config_hash=assistant_config_hash(assistant_version.config),
                 context=assistant_version.context,
                 graph_id=assistant_version.graph_id,
                 version=version,
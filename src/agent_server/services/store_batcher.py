@@ -0,0 +1,175 @@
+"""Coalesces store writes so their embeddings are requested in batches."""
+
+import asyncio
+from typing import Any
+
+import structlog
+from langgraph.store.base import BaseStore, InvalidNamespaceError, PutOp
+
+logger = structlog.get_logger(__name__)
+
+_STOP = None
+
+
+def _validate_namespace(namespace: tuple[str, ...]) -> None:
+    """Reject the namespaces ``BaseStore.aput`` rejects; ``abatch`` doesn't check.
+
+    Mirrors langgraph's (private) rules: labels must be non-empty strings
+    without periods, and the root label can't be ``"langgraph"``.
+    """
+    if not namespace:
+        raise InvalidNamespaceError("Namespace cannot be empty.")
+    for label in namespace:
+        if not isinstance(label, str) or not label or "." in label:
+            raise InvalidNamespaceError(
+                f"Invalid namespace label {label!r} found in {namespace}. Namespace "
+                "labels must be non-empty strings without periods ('.')."
+            )
+    if namespace[0] == "langgraph":
+        raise InvalidNamespaceError(
+            f'Root label for namespace cannot be "langgraph". Got: {namespace}'
+        )
+
+
+class StoreWriteBatcher:
+    """Groups concurrent store writes into a single ``store.abatch`` call.
+
+    With semantic search enabled every ``aput`` makes its own embeddings request.
+    A write that finds the queue otherwise empty is flushed right away; when more
+    writes are already waiting, the worker collects them for up to ``MAX_DELAY``
+    seconds (and ``MAX_BATCH`` writes) and sends them as one batch, which the
+    Postgres store embeds with a single ``aembed_documents`` call.
+    """
+
+    MAX_BATCH = 96
+    MAX_DELAY = 0.05  # seconds
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue | None = None
+        self._worker_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._worker_task is None or self._worker_task.done():
+            self._queue = asyncio.Queue()
+            self._worker_task = asyncio.create_task(self._worker_loop(self._queue))
+
+    async def stop(self) -> None:
+        """Flush the writes already queued and stop the worker."""
+        queue, self._queue = self._queue, None
+        if queue is not None and self._worker_task and not self._worker_task.done():
+            queue.put_nowait(_STOP)
+            await self._worker_task
+        self._worker_task = None
+
+    async def put(
+        self,
+        store: BaseStore,
+        namespace: tuple[str, ...],
+        key: str,
+        value: dict[str, Any],
+    ) -> None:
+        """Store an item, batched with other writes when the worker is running."""
+        queue = self._queue
+        if queue is None or self._worker_task is None or self._worker_task.done():
+            await store.aput(namespace=namespace, key=key, value=value)
+            return
+
+        _validate_namespace(namespace)
+        ttl_config = getattr(store, "ttl_config", None)
+        op = PutOp(
+            namespace,
+            str(key),
+            value,
+            ttl=ttl_config.get("default_ttl") if ttl_config else None,
+        )
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.put_nowait((store, op, future))
+        await future
+
+    async def _worker_loop(self, queue: asyncio.Queue) -> None:
+        batch: list[tuple[BaseStore, PutOp, asyncio.Future]] = []
+        try:
+            await self._process(queue, batch)
+        finally:
+            # Whatever ended the loop, nobody may be left awaiting a write
+            while not queue.empty():
+                if (item := queue.get_nowait()) is not _STOP:
+                    batch.append(item)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("Store write batcher stopped before flushing")
+                    )
+
+    async def _process(
+        self,
+        queue: asyncio.Queue,
+        batch: list[tuple[BaseStore, PutOp, asyncio.Future]],
+    ) -> None:
+        """Flush queued writes until the stop sentinel.
+
+        ``batch`` holds the writes being flushed, so the caller can fail them if
+        this coroutine exits abnormally.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                return
+            batch[:] = [item]
+            # Only wait for company when other writes are already queued
+            if not queue.empty():
+                deadline = loop.time() + self.MAX_DELAY
+                while len(batch) < self.MAX_BATCH:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+            await self._flush(batch)
+            batch.clear()
+
+    @staticmethod
+    async def _flush(batch: list[tuple[BaseStore, PutOp, asyncio.Future]]) -> None:
+        by_store: dict[BaseStore, list[tuple[PutOp, asyncio.Future]]] = {}
+        for store, op, future in batch:
+            by_store.setdefault(store, []).append((op, future))
+
+        for store, items in by_store.items():
+            try:
+                await store.abatch([op for op, _ in items])
+            except Exception as exc:
+                if len(items) == 1:
+                    if not items[0][1].done():
+                        items[0][1].set_exception(exc)
+                    continue
+                logger.warning(
+                    "Batched store write failed, retrying items one by one",
+                    batch_size=len(items),
+                    exc_info=True,
+                )
+                # Retry individually so one bad item only fails its own request
+                for op, future in items:
+                    try:
+                        await store.abatch([op])
+                    except Exception as item_exc:
+                        if not future.done():
+                            future.set_exception(item_exc)
+                    else:
+                        if not future.done():
+                            future.set_result(None)
+                continue
+
+            for _, future in items:
+                if not future.done():
+                    future.set_result(None)
+
+
+store_write_batcher = StoreWriteBatcher()
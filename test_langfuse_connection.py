@@ -1,50 +1,66 @@
 """Test script to verify Langfuse connection and send a test trace."""
 import os
+import sys
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
-print("=" * 50)
-print("Langfuse Connection Test (v3 SDK)")
-print("=" * 50)
+# Output lines are collected and written once per section
+_out: list[str] = []
+
+
+def _flush_output() -> None:
+    if _out:
+        sys.stdout.write("\n".join(_out) + "\n")
+        sys.stdout.flush()
+        _out.clear()
+
+
+_out.append("=" * 50)
+_out.append("Langfuse Connection Test (v3 SDK)")
+_out.append("=" * 50)
 
 # Check environment variables
-print("\n1. Checking environment variables:")
+_out.append("\n1. Checking environment variables:")
 public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
 secret_key = os.getenv("LANGFUSE_SECRET_KEY")
 host = os.getenv("LANGFUSE_HOST")
 tracing = os.getenv("LANGFUSE_TRACING")
 logging_env = os.getenv("LANGFUSE_LOGGING")
 
-print(f"   LANGFUSE_PUBLIC_KEY: {'[OK] Set' if public_key else '[ERROR] Not set'}")
-print(f"   LANGFUSE_SECRET_KEY: {'[OK] Set' if secret_key else '[ERROR] Not set'}")
-print(f"   LANGFUSE_HOST: {host or '[ERROR] Not set'}")
-print(f"   LANGFUSE_TRACING: {tracing}")
-print(f"   LANGFUSE_LOGGING: {logging_env}")
+_out.append(f"   LANGFUSE_PUBLIC_KEY: {'[OK] Set' if public_key else '[ERROR] Not set'}")
+_out.append(f"   LANGFUSE_SECRET_KEY: {'[OK] Set' if secret_key else '[ERROR] Not set'}")
+_out.append(f"   LANGFUSE_HOST: {host or '[ERROR] Not set'}")
+_out.append(f"   LANGFUSE_TRACING: {tracing}")
+_out.append(f"   LANGFUSE_LOGGING: {logging_env}")
 
 if not all([public_key, secret_key, host]):
-    print("\n[ERROR] Missing required environment variables!")
+    _out.append("\n[ERROR] Missing required environment variables!")
+    _flush_output()
     exit(1)
+_flush_output()
 
 # Test Langfuse client using v3 SDK
-print("\n2. Testing Langfuse client initialization (v3 SDK):")
+_out.append("\n2. Testing Langfuse client initialization (v3 SDK):")
 try:
-    from langfuse._client.get_client import get_client
+    from langfuse import get_client
 
     client = get_client()
-    print("   [OK] Langfuse client initialized successfully via get_client()")
+    _out.append("   [OK] Langfuse client initialized successfully via get_client()")
 except Exception as e:
-    print(f"   [ERROR] Failed to initialize Langfuse client: {e}")
+    _out.append(f"   [ERROR] Failed to initialize Langfuse client: {e}")
     import traceback
+    _flush_output()
     traceback.print_exc()
     exit(1)
 
+_flush_output()
+
 # Send a test trace using v3 SDK
-print("\n3. Sending test trace using v3 SDK:")
+_out.append("\n3. Sending test trace using v3 SDK:")
 try:
     # In v3 SDK, we use spans and generations directly
-    from langfuse._client.span import LangfuseSpan
-
     # Create a trace (span) directly from the client
     span = client.start_observation(
         name="test-connection-trace",
@@ -77,34 +93,41 @@ try:
     span.update(output={"result": "success"})
     span.end()
 
-    print(f"   [OK] Test trace created with ID: {span.trace_id}")
-    print(f"   Trace URL: {host}/trace/{span.trace_id}")
+    _out.append(f"   [OK] Test trace created with ID: {span.trace_id}")
+    _out.append(f"   Trace URL: {host}/trace/{span.trace_id}")
 
 except Exception as e:
-    print(f"   [ERROR] Failed to create test trace: {e}")
+    _out.append(f"   [ERROR] Failed to create test trace: {e}")
     import traceback
+    _flush_output()
     traceback.print_exc()
     exit(1)
 
+_flush_output()
+
 # Flush the client to ensure data is sent
-print("\n4. Flushing data to Langfuse:")
+_out.append("\n4. Flushing data to Langfuse:")
 try:
     client.flush()
-    print("   [OK] Data flushed successfully")
+    _out.append("   [OK] Data flushed successfully")
 except Exception as e:
-    print(f"   [ERROR] Failed to flush data: {e}")
+    _out.append(f"   [ERROR] Failed to flush data: {e}")
     import traceback
+    _flush_output()
     traceback.print_exc()
 
+_flush_output()
+
 # Shutdown
-print("\n5. Shutting down client:")
+_out.append("\n5. Shutting down client:")
 try:
     client.shutdown()
-    print("   [OK] Client shutdown successfully")
+    _out.append("   [OK] Client shutdown successfully")
 except Exception as e:
-    print(f"   [WARNING] Shutdown: {e}")
+    _out.append(f"   [WARNING] Shutdown: {e}")
 
-print("\n" + "=" * 50)
-print("Test completed! Check your Langfuse dashboard for the test trace.")
-print(f"Dashboard URL: {host}")
-print("=" * 50)
+_out.append("\n" + "=" * 50)
+_out.append("Test completed! Check your Langfuse dashboard for the test trace.")
+_out.append(f"Dashboard URL: {host}")
+_out.append("=" * 50)
+_flush_output()
@@ -0,0 +1,19 @@
+"""Unit tests for store API helpers"""
+
+from agent_server.api.store import clean_unicode_surrogates
+
+
+def test_clean_unicode_surrogates_removes_lone_surrogates():
+    assert clean_unicode_surrogates("a\ud800b\udc00c") == "abc"
+
+
+def test_clean_unicode_surrogates_keeps_surrogate_pairs():
+    pair = "\ud83d\ude00"
+
+    assert clean_unicode_surrogates(f"x{pair}\ud83dy") == f"x{pair}y"
+
+
+def test_clean_unicode_surrogates_recurses_into_containers():
+    value = {"a": ["ok", "bad\udfff"], "b": 1, "c": None}
+
+    assert clean_unicode_surrogates(value) == {"a": ["ok", "bad"], "b": 1, "c": None}
@@ -0,0 +1,36 @@
+"""Unit tests for ORM helpers"""
+
+from src.agent_server.core.orm import (
+    Assistant,
+    _hash_config_on_insert,
+    assistant_config_hash,
+)
+
+
+def test_assistant_config_hash_ignores_key_order():
+    first = {"configurable": {"a": 1, "b": [1, 2]}, "tags": ["x"]}
+    second = {"tags": ["x"], "configurable": {"b": [1, 2], "a": 1}}
+
+    assert assistant_config_hash(first) == assistant_config_hash(second)
+
+
+def test_assistant_config_hash_distinguishes_configs():
+    assert assistant_config_hash({"a": 1}) != assistant_config_hash({"a": 2})
+
+
+def test_assistant_config_hash_treats_missing_config_as_empty():
+    assert assistant_config_hash(None) == assistant_config_hash({})
+
+
+def test_config_hash_set_before_insert():
+    assistant = Assistant(graph_id="g", user_id="u", name="n", config={"k": "v"})
+
+    _hash_config_on_insert(None, None, assistant)
+
+    assert assistant.config_hash == assistant_config_hash({"k": "v"})
+
+
+def test_assistant_config_hash_fits_in_bigint():
+    value = assistant_config_hash({"k": "v"})
+
+    assert -(2**63) <= value < 2**63
@@ -0,0 +1,11 @@
+"""Unit tests for lazy construction of the dragon_chat_agent graph"""
+
+import importlib
+
+
+def test_importing_agent_module_does_not_build_agent():
+    module = importlib.import_module("graphs.dragon_chat_agent.dragon_chat_agent")
+
+    importlib.reload(module)
+
+    assert module.get_agent.cache_info().currsize == 0
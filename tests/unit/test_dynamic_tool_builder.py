@@ -1,18 +1,32 @@
+import asyncio
 import types
 
+import httpx
+import orjson
 import pytest
 import requests
 
 from graphs.dragon_chat_agent.context import DragonAgentContext
-from graphs.dragon_chat_agent.middleware.pre_agent_middleware import PreAgentMiddleware
-from graphs.dragon_chat_agent.tools.build_tool_from_config import build_tool_from_config
+from graphs.dragon_chat_agent.middleware.pre_agent_middleware import (
+    MAX_MESSAGES,
+    PreAgentMiddleware,
+)
+from graphs.dragon_chat_agent.tools.build_tool_from_config import (
+    _get_http_async_client,
+    _get_http_session,
+    _sanitize_tool_name,
+    build_tool_from_config,
+)
 
 
 class _Resp:
+    __slots__ = ("status_code", "_json_data", "text", "content")
+
     def __init__(self, status_code: int = 200, json_data=None, text: str = "ok"):
         self.status_code = status_code
         self._json_data = {} if json_data is None else json_data
         self.text = text
+        self.content = orjson.dumps(self._json_data)
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -22,6 +36,11 @@ class _Resp:
         return self._json_data
 
 
+# Responses are only read, so the fakes can share these instances
+_OK_RESP = _Resp(200, json_data={"ok": True})
+_STATUS_OK_RESP = _Resp(200, json_data={"status": "ok"})
+
+
 def test_build_tool_sanitizes_name_and_pre_agent_uses_it(monkeypatch):
     cfg = {
         "name": "Mi Tool ñ con espacios",
@@ -32,9 +51,9 @@ def test_build_tool_sanitizes_name_and_pre_agent_uses_it(monkeypatch):
 
     # Prevent real network calls
     monkeypatch.setattr(
-        requests,
+        _get_http_session(),
         "post",
-        lambda *args, **kwargs: _Resp(200, json_data={"ok": True}),
+        lambda *args, **kwargs: _OK_RESP,
     )
 
     middleware = PreAgentMiddleware()
@@ -47,17 +66,32 @@ def test_build_tool_sanitizes_name_and_pre_agent_uses_it(monkeypatch):
     assert tool_specs[0]["function"]["name"] == tool.name
 
 
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("get_weather", ("get_weather", False)),
+        ("get weather!", ("get_weather", True)),
+        ("_private_", ("private", True)),
+        ("-dash", ("tool-dash", True)),
+        ("name\n", ("name", False)),
+        ("", ("tool", True)),
+    ],
+)
+def test_sanitize_tool_name(raw, expected):
+    assert _sanitize_tool_name(raw) == expected
+
+
 def test_tool_accepts_non_identifier_properties_and_posts_original_keys(monkeypatch):
     captured = {}
 
-    def _fake_post(url, json, headers=None, timeout=None):
+    def _fake_post(url, data, headers=None, timeout=None):
         captured["url"] = url
-        captured["json"] = json
+        captured["json"] = orjson.loads(data)
         captured["headers"] = headers
         captured["timeout"] = timeout
-        return _Resp(200, json_data={"status": "ok"})
+        return _STATUS_OK_RESP
 
-    monkeypatch.setattr(requests, "post", _fake_post)
+    monkeypatch.setattr(_get_http_session(), "post", _fake_post)
 
     tool = build_tool_from_config(
         {
@@ -77,11 +111,87 @@ def test_tool_accepts_non_identifier_properties_and_posts_original_keys(monkeypa
     assert captured["json"] == {"user-id": "abc"}
 
 
+def test_tool_posts_validated_arguments_without_unset_fields(monkeypatch):
+    captured = {}
+
+    def _fake_post(url, data, headers=None, timeout=None):
+        captured["json"] = orjson.loads(data)
+        return _STATUS_OK_RESP
+
+    monkeypatch.setattr(_get_http_session(), "post", _fake_post)
+
+    tool = build_tool_from_config(
+        {
+            "name": "search",
+            "url": "https://example.com/webhook",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                    "limit": {"type": "integer"},
+                    "filters": {"type": "object"},
+                },
+                "required": ["query"],
+            },
+        }
+    )
+
+    tool.invoke({"query": "dragones", "limit": "5"})
+    assert captured["json"] == {"query": "dragones", "limit": 5}
+
+
+def test_tool_caps_non_json_bodies(monkeypatch):
+    class _TextResp(_Resp):
+        def __init__(self, status_code: int, body: bytes):
+            super().__init__(status_code)
+            self.content = body
+
+    tool = build_tool_from_config(
+        {
+            "name": "t",
+            "url": "https://example.com/webhook",
+            "schema": {"type": "object", "properties": {}, "required": []},
+            "max_body_bytes": 10,
+        }
+    )
+
+    monkeypatch.setattr(
+        _get_http_session(), "post", lambda *a, **kw: _TextResp(200, b"<html>" * 100)
+    )
+    out = tool.invoke({})
+    assert out["status"] == "ok"
+    assert out["text"] == "<html><htm"
+
+    monkeypatch.setattr(
+        _get_http_session(), "post", lambda *a, **kw: _TextResp(502, b"x" * 10_000)
+    )
+    out = tool.invoke({})
+    assert out["status"] == "error"
+    assert out["body"] == "x" * 2048
+
+
+def test_tools_with_same_schema_share_args_model():
+    schema = {
+        "type": "object",
+        "properties": {"query": {"type": "string"}},
+        "required": ["query"],
+    }
+
+    first = build_tool_from_config(
+        {"name": "lookup", "url": "https://a.example.com/hook", "schema": schema}
+    )
+    second = build_tool_from_config(
+        {"name": "lookup", "url": "https://b.example.com/hook", "schema": dict(schema)}
+    )
+
+    assert first.args_schema is second.args_schema
+
+
 def test_tool_returns_serializable_error_on_timeout(monkeypatch):
     def _raise_timeout(*args, **kwargs):
         raise requests.Timeout("boom")
 
-    monkeypatch.setattr(requests, "post", _raise_timeout)
+    monkeypatch.setattr(_get_http_session(), "post", _raise_timeout)
 
     tool = build_tool_from_config(
         {
@@ -95,3 +205,233 @@ def test_tool_returns_serializable_error_on_timeout(monkeypatch):
     assert out["status"] == "error"
     assert out["error_type"] == "Timeout"
 
+
+@pytest.mark.asyncio
+async def test_tool_coroutine_posts_with_async_client(monkeypatch):
+    captured = {}
+
+    async def _fake_post(url, content, headers=None, timeout=None):
+        captured["json"] = orjson.loads(content)
+        captured["headers"] = headers
+        captured["timeout"] = timeout
+        return httpx.Response(200, json={"status": "ok"}, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(_get_http_async_client(), "post", _fake_post)
+
+    tool = build_tool_from_config(
+        {
+            "name": "t",
+            "url": "https://example.com/webhook",
+            "schema": {"type": "object", "properties": {"q": {"type": "string"}}},
+        }
+    )
+
+    out = await tool.ainvoke({"q": "hi"})
+    assert out["status"] == "ok"
+    assert captured["json"] == {"q": "hi"}
+    assert captured["headers"]["Content-Type"] == "application/json"
+    assert captured["timeout"] == httpx.Timeout(30, connect=10)
+
+
+@pytest.mark.asyncio
+async def test_tool_coroutine_returns_serializable_error_on_timeout(monkeypatch):
+    async def _raise_timeout(*args, **kwargs):
+        raise httpx.ReadTimeout("boom")
+
+    monkeypatch.setattr(_get_http_async_client(), "post", _raise_timeout)
+
+    tool = build_tool_from_config(
+        {
+            "name": "t",
+            "url": "https://example.com/webhook",
+            "schema": {"type": "object", "properties": {}, "required": []},
+        }
+    )
+
+    out = await tool.ainvoke({})
+    assert out["status"] == "error"
+    assert out["error_type"] == "ReadTimeout"
+
+
+@pytest.mark.asyncio
+async def test_configured_content_type_replaces_default_case_insensitively(monkeypatch):
+    captured = {}
+
+    async def _fake_post(url, content, headers=None, timeout=None):
+        captured["headers"] = httpx.Request("POST", url, headers=headers).headers
+        return httpx.Response(200, json={}, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(_get_http_async_client(), "post", _fake_post)
+
+    tool = build_tool_from_config(
+        {
+            "name": "t",
+            "url": "https://example.com/webhook",
+            "headers": {"content-type": "application/vnd.api+json"},
+            "schema": {"type": "object", "properties": {}, "required": []},
+        }
+    )
+
+    await tool.ainvoke({})
+    content_types = captured["headers"].get_list("content-type")
+    assert content_types == ["application/vnd.api+json"]
+
+
+@pytest.mark.asyncio
+async def test_unencodable_payload_returns_error_instead_of_raising(monkeypatch):
+    def _unexpected_post(*args, **kwargs):
+        raise AssertionError("nothing should be sent")
+
+    monkeypatch.setattr(_get_http_session(), "post", _unexpected_post)
+    monkeypatch.setattr(_get_http_async_client(), "post", _unexpected_post)
+
+    tool = build_tool_from_config(
+        {
+            "name": "t",
+            "url": "https://example.com/webhook",
+            "schema": {"type": "object", "properties": {"n": {"type": "integer"}}},
+        }
+    )
+
+    for out in (tool.invoke({"n": 2**70}), await tool.ainvoke({"n": 2**70})):
+        assert out["status"] == "error"
+        assert "64-bit" in out["error"]
+
+
+def test_async_client_is_per_event_loop():
+    async def _client():
+        return _get_http_async_client(), _get_http_async_client()
+
+    first, same = asyncio.run(_client())
+    second, _ = asyncio.run(_client())
+    assert first is same
+    assert first is not second
+    assert first.follow_redirects
+
+
+
+def test_runtime_tooling_is_reused_for_identical_configs(monkeypatch):
+    cfg = {
+        "name": "cached",
+        "url": "https://example.com/webhook",
+        "schema": {"type": "object", "properties": {}, "required": []},
+    }
+    middleware = PreAgentMiddleware()
+
+    first_tools, first_specs = middleware._build_runtime_tooling(
+        DragonAgentContext(tools=[cfg])
+    )
+    second_tools, second_specs = middleware._build_runtime_tooling(
+        DragonAgentContext(tools=[dict(cfg)])
+    )
+
+    assert first_tools["cached"] is second_tools["cached"]
+    assert first_specs == second_specs
+    # Returned containers are copies, so callers can't corrupt the cache
+    assert first_tools is not second_tools
+    assert first_specs is not second_specs
+
+
+def test_runtime_tooling_only_builds_new_tools(monkeypatch):
+    import graphs.dragon_chat_agent.middleware.pre_agent_middleware as pam
+
+    def _cfg(name: str) -> dict:
+        return {
+            "name": name,
+            "url": "https://example.com/webhook",
+            "schema": {"type": "object", "properties": {}, "required": []},
+        }
+
+    built: list[str] = []
+
+    def _counting_build(cfg):
+        built.append(cfg["name"])
+        return build_tool_from_config(cfg)
+
+    monkeypatch.setattr(pam, "build_tool_from_config", _counting_build)
+    middleware = PreAgentMiddleware()
+
+    middleware._build_runtime_tooling(DragonAgentContext(tools=[_cfg("per_tool_a")]))
+    tools, specs = middleware._build_runtime_tooling(
+        DragonAgentContext(tools=[_cfg("per_tool_a"), _cfg("per_tool_b")])
+    )
+
+    assert built == ["per_tool_a", "per_tool_b"]
+    assert list(tools) == ["per_tool_a", "per_tool_b"]
+    assert [spec["function"]["name"] for spec in specs] == ["per_tool_a", "per_tool_b"]
+
+
+def test_should_force_tool_until_a_dynamic_tool_was_used():
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    tool_names = frozenset({"lookup"})
+    earlier_turn = [
+        HumanMessage("hola"),
+        AIMessage("", tool_calls=[{"id": "1", "name": "lookup", "args": {}}]),
+        ToolMessage("ok", tool_call_id="1", name="lookup"),
+        AIMessage("respuesta"),
+    ]
+
+    # No dynamic tool in the history yet -> force it
+    assert PreAgentMiddleware._should_force_tool(
+        {"messages": earlier_turn[:1]}, tool_names
+    )
+    # Used anywhere in the history, even in an earlier turn -> don't force again
+    assert not PreAgentMiddleware._should_force_tool(
+        {"messages": [*earlier_turn, HumanMessage("gracias")]}, tool_names
+    )
+
+
+def test_prepare_model_request_trims_and_validates_in_one_override():
+    from langchain.agents.middleware.types import ModelRequest
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    history = [HumanMessage(f"m{i}") for i in range(MAX_MESSAGES + 5)]
+    history.append(AIMessage("", tool_calls=[{"id": "x", "name": "lookup", "args": {}}]))
+    request = ModelRequest(
+        model=None,
+        system_prompt=None,
+        messages=history,
+        tool_choice=None,
+        tools=[],
+        response_format=None,
+        state={"messages": history},
+        runtime=types.SimpleNamespace(context=DragonAgentContext()),
+    )
+
+    prepared = PreAgentMiddleware()._prepare_model_request(request)
+
+    # Last MAX_MESSAGES kept, plus the error ToolMessage for the unanswered call
+    assert len(prepared.messages) == MAX_MESSAGES + 1
+    assert prepared.messages[:MAX_MESSAGES] == history[-MAX_MESSAGES:]
+    assert prepared.messages[-1].tool_call_id == "x"
+    assert prepared.state["messages"] is prepared.messages
+
+
+def test_tool_caches_responses_when_configured(monkeypatch):
+    calls = []
+
+    def _fake_post(url, data, headers=None, timeout=None):
+        calls.append(data)
+        return _Resp(200, json_data={"status": "ok", "n": len(calls)})
+
+    monkeypatch.setattr(_get_http_session(), "post", _fake_post)
+
+    def _build(**extra):
+        return build_tool_from_config(
+            {
+                "name": "cached_lookup",
+                "url": "https://example.com/webhook",
+                "schema": {"type": "object", "properties": {"q": {"type": "string"}}},
+                **extra,
+            }
+        )
+
+    cached_tool = _build(cache_results=True)
+    assert cached_tool.invoke({"q": "a"})["n"] == 1
+    assert cached_tool.invoke({"q": "a"})["n"] == 1
+    assert cached_tool.invoke({"q": "b"})["n"] == 2
+
+    uncached_tool = _build()
+    assert uncached_tool.invoke({"q": "a"})["n"] == 3
+    assert uncached_tool.invoke({"q": "a"})["n"] == 4
@@ -0,0 +1,48 @@
+"""Unit tests for the dragon_chat_agent message validator"""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from graphs.dragon_chat_agent.utils.message_validator import (
+    validate_and_clean_messages,
+)
+
+
+def _ai(*call_ids: str) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[{"id": cid, "name": f"tool_{cid}", "args": {}} for cid in call_ids],
+    )
+
+
+def test_complete_history_is_returned_unchanged():
+    messages = [
+        HumanMessage(content="hola"),
+        _ai("a", "b"),
+        ToolMessage(content="ok", tool_call_id="a"),
+        ToolMessage(content="ok", tool_call_id="b"),
+        AIMessage(content="listo"),
+    ]
+
+    assert validate_and_clean_messages(messages) is messages
+
+
+def test_missing_responses_are_added_after_their_ai_message():
+    first, second = _ai("a", "b"), _ai("c")
+    answered = ToolMessage(content="ok", tool_call_id="a")
+    # A late response for "c" after the next AIMessage does not count
+    messages = [
+        first,
+        answered,
+        second,
+        AIMessage(content="x"),
+        ToolMessage(content="tarde", tool_call_id="c"),
+    ]
+
+    cleaned = validate_and_clean_messages(messages)
+
+    assert cleaned[0] is first
+    assert (cleaned[1].tool_call_id, cleaned[1].name) == ("b", "tool_b")
+    assert cleaned[2] is answered
+    assert cleaned[3] is second
+    assert cleaned[4].tool_call_id == "c"
+    assert cleaned[5:] == messages[3:]
@@ -387,3 +387,178 @@ async def test_middleware_handles_json_array():
     await middleware(scope, receive, send)
 
     assert app.called
+
+
+async def _body_seen_by_app(body: bytes) -> tuple[bytes, list]:
+    """Run the middleware on a JSON POST and return the body and headers the app got"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["headers"] = scope["headers"]
+        seen["body"] = (await receive())["body"]
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/threads",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    await DoubleEncodedJSONMiddleware(app)(scope, receive, AsyncMock())
+    return seen["body"], seen["headers"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_rewrites_double_encoded_body():
+    """Test that the app receives the inner JSON and a matching content-length"""
+    inner = {"limit": 10, "name": "dragón"}
+    body, headers = await _body_seen_by_app(
+        b"  " + json.dumps(json.dumps(inner)).encode("utf-8")
+    )
+
+    assert json.loads(body) == inner
+    assert (b"content-length", str(len(body)).encode()) in headers
+
+
+@pytest.mark.asyncio
+async def test_middleware_leaves_plain_json_string_untouched():
+    """Test that a JSON string whose content isn't JSON passes through as-is"""
+    original = b'"just text"'
+    body, headers = await _body_seen_by_app(original)
+
+    assert body is original
+    assert headers == [(b"content-type", b"application/json")]
+
+
+@pytest.mark.asyncio
+async def test_middleware_replaces_existing_content_length():
+    """Test that a rewritten body updates content-length instead of adding another"""
+    seen = {}
+    body = json.dumps(json.dumps({"a": 1})).encode("utf-8")
+
+    async def app(scope, receive, send):
+        seen["headers"] = scope["headers"]
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/threads",
+        "headers": [
+            (b"content-length", str(len(body)).encode()),
+            (b"content-type", b"application/json"),
+        ],
+    }
+    await DoubleEncodedJSONMiddleware(app)(scope, receive, AsyncMock())
+
+    assert seen["headers"] == [
+        (b"content-length", b"7"),
+        (b"content-type", b"application/json"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_middleware_streams_bodies_above_inspect_limit():
+    """Test that large declared bodies reach the app with the original receive"""
+    app = AsyncMock()
+    middleware = DoubleEncodedJSONMiddleware(app, max_inspect_bytes=16)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/threads",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", b"17"),
+        ],
+    }
+    receive = AsyncMock()
+    send = AsyncMock()
+
+    await middleware(scope, receive, send)
+
+    app.assert_called_once_with(scope, receive, send)
+    receive.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        [(b"content-type", b"application/json"), (b"content-length", b"0")],
+        [(b"content-type", b"application/json")],
+    ],
+)
+@pytest.mark.asyncio
+async def test_middleware_skips_requests_without_body(headers):
+    """Test that HTTP/1.1 requests declaring no body never read from receive"""
+    app = AsyncMock()
+    middleware = DoubleEncodedJSONMiddleware(app)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "path": "/threads",
+        "headers": headers,
+    }
+    receive = AsyncMock()
+    send = AsyncMock()
+
+    await middleware(scope, receive, send)
+
+    app.assert_called_once_with(scope, receive, send)
+    receive.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_middleware_replays_unchanged_messages():
+    """Test that unchanged bodies reach the app as the original messages"""
+    chunks = [
+        {"type": "http.request", "body": b'{"a": ', "more_body": True},
+        {"type": "http.request", "body": b"1}", "more_body": False},
+    ]
+    pending = list(chunks)
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(await receive())
+        seen.append(await receive())
+
+    async def receive():
+        return pending.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/threads",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    await DoubleEncodedJSONMiddleware(app)(scope, receive, AsyncMock())
+
+    assert seen[0] is chunks[0]
+    assert seen[1] is chunks[1]
+
+
+@pytest.mark.asyncio
+async def test_middleware_limited_to_configured_paths():
+    """Test that paths outside the configured prefixes are passed through"""
+    app = AsyncMock()
+    middleware = DoubleEncodedJSONMiddleware(app, paths=("/threads",))
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/assistants",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    receive = AsyncMock()
+    send = AsyncMock()
+
+    await middleware(scope, receive, send)
+
+    app.assert_called_once_with(scope, receive, send)
+    receive.assert_not_called()
@@ -0,0 +1,24 @@
+"""Unit tests for the dynamic system prompt template cache"""
+
+from graphs.dragon_chat_agent.middleware.dynamic_prompt import _cached_prompt_template
+
+
+def test_equal_but_differently_typed_metadata_does_not_share_a_template():
+    as_bool = _cached_prompt_template("prompt", {"vip": True}, False)
+    as_int = _cached_prompt_template("prompt", {"vip": 1}, False)
+
+    assert "True" in as_bool.user_context
+    assert "True" not in as_int.user_context
+    assert "1" in as_int.user_context
+
+
+def test_same_metadata_reuses_the_template():
+    first = _cached_prompt_template("prompt", {"tier": "gold"}, True)
+
+    assert _cached_prompt_template("prompt", {"tier": "gold"}, True) is first
+
+
+def test_unserializable_metadata_is_rendered_uncached():
+    template = _cached_prompt_template("prompt", {"tags": {"a"}}, False)
+
+    assert "tags" in template.user_context
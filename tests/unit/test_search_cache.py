@@ -0,0 +1,41 @@
+"""Unit tests for the knowledge base search result cache"""
+
+from graphs.dragon_chat_agent.utils.search_cache import (
+    SearchResultCache,
+    normalize_query,
+)
+
+
+def test_lookup_matches_normalized_query_only():
+    cache = SearchResultCache(ttl=60)
+    cache.put("ns", "¿Cuál es el horario?", "answer")
+
+    assert cache.get("ns", "  cuál es el   HORARIO ") == "answer"
+    assert cache.get("ns", "¿Cuál es el precio?") is None
+
+
+def test_entries_are_scoped_by_namespace_and_invalidated():
+    cache = SearchResultCache(ttl=60)
+    cache.put("a", "q", "answer")
+
+    assert cache.get("b", "q") is None
+
+    cache.invalidate("a")
+    assert cache.get("a", "q") is None
+
+
+def test_entries_expire_and_are_evicted():
+    expired = SearchResultCache(ttl=-1)
+    expired.put("ns", "q", "answer")
+    assert expired.get("ns", "q") is None
+
+    small = SearchResultCache(ttl=60, capacity=1)
+    small.put("ns", "old", "old answer")
+    small.put("ns", "new", "new answer")
+    assert small.get("ns", "old") is None
+    assert small.get("ns", "new") == "new answer"
+
+
+def test_cache_disabled_by_zero_ttl():
+    assert not SearchResultCache(ttl=0).enabled
+    assert normalize_query(" Hola\tMundo? ") == "hola mundo"
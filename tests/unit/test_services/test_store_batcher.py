@@ -0,0 +1,118 @@
+"""Unit tests for the store write batcher"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from langgraph.store.base import InvalidNamespaceError
+
+from src.agent_server.services.store_batcher import StoreWriteBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_puts_share_one_batch():
+    store = AsyncMock()
+    store.ttl_config = None
+    batcher = StoreWriteBatcher()
+    await batcher.start()
+
+    await asyncio.gather(
+        *(batcher.put(store, ("users", "u"), f"k{i}", {"i": i}) for i in range(5))
+    )
+    await batcher.stop()
+
+    store.abatch.assert_awaited_once()
+    ops = store.abatch.await_args.args[0]
+    assert [op.key for op in ops] == [f"k{i}" for i in range(5)]
+    store.aput.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_item_only_fails_its_own_put():
+    async def abatch(ops):
+        if any(op.key == "bad" for op in ops):
+            raise ValueError("boom")
+        return [None] * len(ops)
+
+    store = AsyncMock()
+    store.ttl_config = None
+    store.abatch.side_effect = abatch
+    batcher = StoreWriteBatcher()
+    await batcher.start()
+
+    results = await asyncio.gather(
+        batcher.put(store, ("users", "u"), "good", {}),
+        batcher.put(store, ("users", "u"), "bad", {}),
+        return_exceptions=True,
+    )
+    await batcher.stop()
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_put_without_worker_writes_directly():
+    store = AsyncMock()
+
+    await StoreWriteBatcher().put(store, ("users", "u"), "k", {"a": 1})
+
+    store.aput.assert_awaited_once_with(
+        namespace=("users", "u"), key="k", value={"a": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_lone_put_is_flushed_without_waiting():
+    store = AsyncMock()
+    store.ttl_config = None
+    batcher = StoreWriteBatcher()
+    batcher.MAX_DELAY = 60
+    await batcher.start()
+
+    await asyncio.wait_for(batcher.put(store, ("users", "u"), "k", {}), timeout=1)
+    await batcher.stop()
+
+    store.abatch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pending_puts_fail_when_worker_dies():
+    started = asyncio.Event()
+
+    async def abatch(ops):
+        started.set()
+        await asyncio.Event().wait()
+
+    store = AsyncMock()
+    store.ttl_config = None
+    store.abatch.side_effect = abatch
+    batcher = StoreWriteBatcher()
+    await batcher.start()
+
+    puts = [
+        asyncio.create_task(batcher.put(store, ("users", "u"), f"k{i}", {}))
+        for i in range(2)
+    ]
+    await started.wait()
+    batcher._worker_task.cancel()
+    results = await asyncio.gather(*puts, return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "namespace", [(), ("a.b",), ("users", ""), ("langgraph", "x")]
+)
+async def test_invalid_namespace_is_rejected_before_batching(namespace):
+    store = AsyncMock()
+    store.ttl_config = None
+    batcher = StoreWriteBatcher()
+    await batcher.start()
+
+    with pytest.raises(InvalidNamespaceError):
+        await batcher.put(store, namespace, "k", {})
+    await batcher.stop()
+
+    store.abatch.assert_not_called()